@@ -1,8 +1,6 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import ORJSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
 from starlette.exceptions import HTTPException
@@ -12,10 +10,15 @@ from app.core.exception_handler import (
     internal_exception_handler,
 )
 from app.core.settings import settings
-from app.core.middleware import log_request_middleware, ResponseFormattingMiddleware
+from app.core.modules import module_registry
+from app.core.middleware import (
+    AccessLogMiddleware,
+    ConcurrencyLimitMiddleware,
+    ResponseFormattingMiddleware,
+)
+from app.core.openapi import router as openapi_router
 from app.core.resources import lifespan
-from app.modules.example.presentation.routers import router as example_router
-from app.modules.health.presentation.routers import router as health_router
+from app.core.responses import DEFAULT_RESPONSE_CLASS
 
 app = FastAPI(
     title=settings.APPLICATION_TITLE,
@@ -25,8 +28,9 @@ app = FastAPI(
         "displayRequestDuration": True,
         "filter": True,
     },
-    default_response_class=ORJSONResponse,
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan,
+    openapi_url=None,
 )
 
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -34,8 +38,11 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(Exception, internal_exception_handler)
 
 
-app.add_middleware(BaseHTTPMiddleware, dispatch=log_request_middleware)
-app.add_middleware(ResponseFormattingMiddleware)
+if settings.CONCURRENCY_LIMIT > 0 or settings.CONCURRENCY_PREFIX_LIMITS:
+    app.add_middleware(ConcurrencyLimitMiddleware)
+app.add_middleware(AccessLogMiddleware)
+if settings.RESPONSE_FORMATTING_MIDDLEWARE:
+    app.add_middleware(ResponseFormattingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -44,13 +51,8 @@ app.add_middleware(
     allow_headers=[settings.SECURITY_API_KEY_HEADER],
 )
 
-routers = [
-    example_router,
-    health_router,
-]
-
-for router in routers:
-    app.include_router(router)
+app.include_router(openapi_router)
+module_registry.register(app, settings.MODULES_ENABLED)
 
 
 def custom_openapi():
@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import hmac
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+import orjson
+from loguru import logger
+
+from app.core.database import get_database_pool
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+
+@dataclass(frozen=True, slots=True)
+class APIKey:
+    key_hash: str
+    name: str
+    scopes: FrozenSet[str] = frozenset()
+    quota: Optional[int] = None
+
+
+def hash_api_key(raw_key: str) -> str:
+    secret = settings.SECURITY_API_KEYS_HMAC_SECRET
+    if secret:
+        return hmac.new(secret.encode(), raw_key.encode(), hashlib.sha256).hexdigest()
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+class APIKeyStore:
+    def __init__(self, path: str, table: str, cache_size: int) -> None:
+        self.path = Path(path) if path else None
+        self.table = table
+        self.cache_size = cache_size
+        self._keys: Dict[str, APIKey] = {}
+        self._verified: OrderedDict[str, APIKey] = OrderedDict()
+        self._mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+        self._reloads = 0
+        self._reload_errors = 0
+        self._loaded_at = 0.0
+
+    def verify(self, raw_key: str) -> Optional[APIKey]:
+        key = self._verified.get(raw_key)
+        if key is not None:
+            self._verified.move_to_end(raw_key)
+            self._hits += 1
+            return key
+
+        self._misses += 1
+        key = self._keys.get(hash_api_key(raw_key))
+        if key is None:
+            self._rejected += 1
+            return None
+
+        self._verified[raw_key] = key
+        if len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return key
+
+    async def load(self) -> None:
+        keys: Dict[str, APIKey] = {}
+        if settings.SECURITY_DEFAULT_API_KEY:
+            key_hash = hash_api_key(settings.SECURITY_DEFAULT_API_KEY)
+            keys[key_hash] = APIKey(
+                key_hash=key_hash,
+                name=settings.SECURITY_DEFAULT_API_KEY_NAME,
+                scopes=frozenset({"*"}),
+            )
+
+        mtime = None
+        if self.path is not None:
+            mtime = self.path.stat().st_mtime
+            content = await asyncio.to_thread(self.path.read_bytes)
+            keys.update(_parse_entries(orjson.loads(content)))
+        if self.table:
+            keys.update(_parse_entries(await self._fetch_table()))
+
+        self._keys = keys
+        self._verified = OrderedDict()
+        self._mtime = mtime
+        self._reloads += 1
+        self._loaded_at = time()
+        logger.info("API keys loaded", keys=len(keys))
+
+    async def start(self) -> None:
+        await self.load()
+        if settings.SECURITY_API_KEYS_RELOAD_INTERVAL > 0 and (
+            self.path is not None or self.table
+        ):
+            self._task = asyncio.create_task(self._watch())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._keys),
+            "cached": len(self._verified),
+            "hits": self._hits,
+            "misses": self._misses,
+            "rejected": self._rejected,
+            "reloads": self._reloads,
+            "reload_errors": self._reload_errors,
+            "loaded_at": self._loaded_at,
+        }
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SECURITY_API_KEYS_RELOAD_INTERVAL)
+            try:
+                if self.table or self._changed():
+                    await self.load()
+            except Exception as exc:
+                self._reload_errors += 1
+                logger.opt(exception=exc).error(
+                    "Failed to reload API keys, keeping the current ones"
+                )
+
+    def _changed(self) -> bool:
+        return self.path is not None and self.path.stat().st_mtime != self._mtime
+
+    async def _fetch_table(self) -> Iterable[Dict[str, Any]]:
+        async with get_database_pool().session() as session:
+            rows = await session.fetch_all(
+                f"SELECT key_hash, name, scopes, quota FROM {self.table}"
+            )
+        return [
+            {
+                "hash": row["key_hash"],
+                "name": row["name"],
+                "scopes": (row["scopes"] or "").split(),
+                "quota": row["quota"],
+            }
+            for row in rows
+        ]
+
+
+def _parse_entries(entries: Iterable[Dict[str, Any]]) -> Dict[str, APIKey]:
+    return {
+        entry["hash"].lower(): APIKey(
+            key_hash=entry["hash"].lower(),
+            name=entry["name"],
+            scopes=frozenset(entry.get("scopes") or ()),
+            quota=entry.get("quota"),
+        )
+        for entry in entries
+    }
+
+
+api_key_store = APIKeyStore(
+    path=settings.SECURITY_API_KEYS_PATH,
+    table=settings.SECURITY_API_KEYS_TABLE,
+    cache_size=settings.SECURITY_API_KEYS_CACHE_SIZE,
+)
+metrics.register_collector("api_keys", api_key_store.stats)
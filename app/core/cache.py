@@ -0,0 +1,285 @@
+import asyncio
+import contextvars
+import copy
+import pickle
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from functools import wraps
+from time import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from app.core.exceptions import StandardException
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+CACHE_BACKENDS = ("memory", "redis")
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: Any
+    expires_at: float
+    stale_until: float
+    error: Optional[StandardException] = None
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: Hashable) -> Optional[CacheEntry]: ...
+
+    @abstractmethod
+    async def set(self, key: Hashable, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: Hashable) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    async def close(self) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._evictions = 0
+
+    async def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "evictions": self._evictions,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str, namespace: str) -> None:
+        self.namespace = namespace
+        from redis.asyncio import from_url
+
+        self._redis = from_url(url)
+
+    async def get(self, key: Hashable) -> Optional[CacheEntry]:
+        payload = await self._redis.get(self._key(key))
+        return pickle.loads(payload) if payload is not None else None
+
+    async def set(self, key: Hashable, entry: CacheEntry) -> None:
+        ttl = max(1, int(entry.stale_until - time()) + 1)
+        await self._redis.set(
+            self._key(key), pickle.dumps(entry, pickle.HIGHEST_PROTOCOL), ex=ttl
+        )
+
+    async def delete(self, key: Hashable) -> None:
+        await self._redis.delete(self._key(key))
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=f"{self.namespace}:*"):
+            await self._redis.delete(key)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "namespace": self.namespace}
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+
+class AsyncCache:
+    def __init__(
+        self,
+        name: str,
+        backend: CacheBackend,
+        ttl: float,
+        negative_ttl: float,
+        stale_ttl: float,
+    ) -> None:
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self._hits = 0
+        self._stale_hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = await self.backend.get(key)
+        now = time()
+
+        if entry is not None and now < entry.stale_until:
+            if now >= entry.expires_at:
+                self._stale_hits += 1
+                self._refresh(key, loader)
+            elif entry.error is not None:
+                self._negative_hits += 1
+            else:
+                self._hits += 1
+
+            if entry.error is not None:
+                raise copy.copy(entry.error).with_traceback(None)
+            return entry.value
+
+        self._misses += 1
+        return await self._load(key, loader)
+
+    async def invalidate(self, key: Hashable) -> None:
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "negative_hits": self._negative_hits,
+            "misses": self._misses,
+            "refreshes": self._refreshes,
+            "refresh_failures": self._refresh_failures,
+            "refreshing": len(self._refreshing),
+            **self.backend.stats(),
+        }
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        except StandardException as exc:
+            if self.negative_ttl > 0 and exc.status_code < 500:
+                now = time()
+                await self.backend.set(
+                    key,
+                    CacheEntry(
+                        None, now + self.negative_ttl, now + self.negative_ttl, exc
+                    ),
+                )
+            raise
+
+        now = time()
+        await self.backend.set(
+            key, CacheEntry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        )
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        # The refresh outlives the request that noticed the stale entry, so it must not
+        # inherit that request's context, its deadline included.
+        task = asyncio.create_task(
+            self._revalidate(key, loader), context=contextvars.Context()
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _revalidate(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> None:
+        self._refreshes += 1
+        try:
+            await self._load(key, loader)
+        except Exception as exc:
+            self._refresh_failures += 1
+            logger.opt(exception=exc).warning(
+                "Cache refresh failed", cache=self.name, key=str(key)
+            )
+
+
+def create_cache_backend(name: str) -> CacheBackend:
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_SIZE)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(
+            settings.CACHE_REDIS_URL, f"{settings.CACHE_NAMESPACE}:{name}"
+        )
+    raise ValueError(
+        f"Invalid cache backend: {settings.CACHE_BACKEND}. "
+        f"Valid backends are: {', '.join(CACHE_BACKENDS)}."
+    )
+
+
+_caches: List[AsyncCache] = []
+
+
+def create_cache(
+    name: str,
+    ttl: Optional[float] = None,
+    negative_ttl: Optional[float] = None,
+    stale_ttl: Optional[float] = None,
+) -> AsyncCache:
+    cache = AsyncCache(
+        name=name,
+        backend=create_cache_backend(name),
+        ttl=settings.CACHE_DEFAULT_TTL if ttl is None else ttl,
+        negative_ttl=settings.CACHE_NEGATIVE_TTL
+        if negative_ttl is None
+        else negative_ttl,
+        stale_ttl=settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl,
+    )
+    _caches.append(cache)
+    metrics.register_collector(f"cache.{name}", cache.stats)
+    return cache
+
+
+def cached(cache: AsyncCache, key: Callable[..., Hashable]):
+    def decorator(method):
+        if not settings.CACHE_ENABLED:
+            return method
+
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            return await cache.get_or_load(
+                key(*args, **kwargs), lambda: method(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+async def close_caches() -> None:
+    for cache in _caches:
+        await cache.close()
@@ -1,6 +1,442 @@
+import asyncio
+import contextvars
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Sequence
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from app.core.deadline import deadline_exceeded, time_budget
+from app.core.exceptions import (
+    DatabasePoolTimeoutException,
+    DeadlineExceededException,
+)
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+POSITIONAL_PARAMETER = re.compile(r"\$(\d+)")
+
+
+class DatabaseDriver(ABC):
+    @abstractmethod
+    async def connect(self) -> Any: ...
+
+    @abstractmethod
+    async def close(self, connection: Any) -> None: ...
+
+    @abstractmethod
+    async def execute(self, connection: Any, query: str, args: Sequence) -> None: ...
+
+    @abstractmethod
+    async def execute_many(
+        self, connection: Any, query: str, args: Iterable[Sequence]
+    ) -> None: ...
+
+    @abstractmethod
+    async def fetch_all(
+        self, connection: Any, query: str, args: Sequence
+    ) -> List[Dict[str, Any]]: ...
+
+
+class SQLiteDriver(DatabaseDriver):
+    def __init__(self, path: str, statement_cache_size: int) -> None:
+        self.path = path
+        self.statement_cache_size = statement_cache_size
+        import aiosqlite
+
+        self._aiosqlite = aiosqlite
+
+    async def connect(self) -> Any:
+        connection = await self._aiosqlite.connect(
+            self.path,
+            isolation_level=None,
+            cached_statements=self.statement_cache_size,
+        )
+        connection.row_factory = sqlite3.Row
+        await connection.execute("PRAGMA journal_mode=WAL")
+        await connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    async def close(self, connection: Any) -> None:
+        await connection.close()
+
+    async def execute(self, connection: Any, query: str, args: Sequence) -> None:
+        await connection.execute(_to_sqlite_parameters(query), tuple(args))
+
+    async def execute_many(
+        self, connection: Any, query: str, args: Iterable[Sequence]
+    ) -> None:
+        await connection.executemany(
+            _to_sqlite_parameters(query), [tuple(row) for row in args]
+        )
+
+    async def fetch_all(
+        self, connection: Any, query: str, args: Sequence
+    ) -> List[Dict[str, Any]]:
+        async with connection.execute(
+            _to_sqlite_parameters(query), tuple(args)
+        ) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+
+class PostgresDriver(DatabaseDriver):
+    def __init__(self, dsn: str, statement_cache_size: int) -> None:
+        self.dsn = dsn
+        self.statement_cache_size = statement_cache_size
+        import asyncpg
+
+        self._asyncpg = asyncpg
+
+    async def connect(self) -> Any:
+        return await self._asyncpg.connect(
+            self.dsn, statement_cache_size=self.statement_cache_size
+        )
+
+    async def close(self, connection: Any) -> None:
+        await connection.close()
+
+    async def execute(self, connection: Any, query: str, args: Sequence) -> None:
+        await connection.execute(query, *args)
+
+    async def execute_many(
+        self, connection: Any, query: str, args: Iterable[Sequence]
+    ) -> None:
+        await connection.executemany(query, args)
+
+    async def fetch_all(
+        self, connection: Any, query: str, args: Sequence
+    ) -> List[Dict[str, Any]]:
+        return [dict(record) for record in await connection.fetch(query, *args)]
+
+
+class DatabaseSession:
+    def __init__(self, driver: DatabaseDriver, connection: Any) -> None:
+        self.driver = driver
+        self.connection = connection
+        self.in_transaction = False
+
+    async def execute(self, query: str, *args: Any) -> None:
+        await self.driver.execute(self.connection, query, args)
+
+    async def execute_many(self, query: str, args: Iterable[Sequence]) -> None:
+        await self.driver.execute_many(self.connection, query, args)
+
+    async def fetch_all(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        return await self.driver.fetch_all(self.connection, query, args)
+
+    async def fetch_one(self, query: str, *args: Any) -> Optional[Dict[str, Any]]:
+        rows = await self.driver.fetch_all(self.connection, query, args)
+        return rows[0] if rows else None
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["DatabaseSession"]:
+        await self.execute("BEGIN")
+        self.in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            await self.execute("ROLLBACK")
+            self.in_transaction = False
+            raise
+        await self.execute("COMMIT")
+        self.in_transaction = False
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        driver: DatabaseDriver,
+        min_size: int,
+        max_size: int,
+        acquire_timeout: float,
+    ) -> None:
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(
+                f"Invalid database pool size: min={min_size}, max={max_size}. "
+                "The sizes must satisfy 0 <= min <= max and max >= 1."
+            )
+
+        self.driver = driver
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: deque[Any] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._max_waiters = 0
+        self._acquired = 0
+        self._timeouts = 0
+        self._acquire_time_total = 0.0
+        self._acquire_time_max = 0.0
+        self._closed = False
+
+    async def open(self) -> None:
+        for _ in range(self.min_size):
+            self._idle.append(await self.driver.connect())
+            self._size += 1
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._idle:
+            await self.driver.close(self._idle.popleft())
+            self._size -= 1
+
+    async def acquire(self) -> Any:
+        start = perf_counter()
+        waiting = self._slots.locked()
+        if waiting:
+            self._waiters += 1
+            self._max_waiters = max(self._max_waiters, self._waiters)
+
+        try:
+            async with asyncio.timeout(time_budget(self.acquire_timeout)):
+                await self._slots.acquire()
+        except TimeoutError:
+            self._timeouts += 1
+            if deadline_exceeded():
+                raise DeadlineExceededException()
+            raise DatabasePoolTimeoutException()
+        finally:
+            if waiting:
+                self._waiters -= 1
+
+        try:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = await self.driver.connect()
+                self._size += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        elapsed = perf_counter() - start
+        self._acquired += 1
+        self._acquire_time_total += elapsed
+        self._acquire_time_max = max(self._acquire_time_max, elapsed)
+        self._in_use += 1
+        return connection
+
+    async def release(self, connection: Any, discard: bool = False) -> None:
+        self._in_use -= 1
+        try:
+            if discard or self._closed:
+                self._size -= 1
+                await self.driver.close(connection)
+            else:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[DatabaseSession]:
+        connection = await self.acquire()
+        session = DatabaseSession(self.driver, connection)
+        discard = False
+        try:
+            yield session
+        except BaseException:
+            if session.in_transaction:
+                discard = True
+            raise
+        finally:
+            await self.release(connection, discard=discard)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "max_size": self.max_size,
+            "waiters": self._waiters,
+            "max_waiters": self._max_waiters,
+            "acquired": self._acquired,
+            "timeouts": self._timeouts,
+            "acquire_time_avg": self._acquire_time_total / self._acquired
+            if self._acquired
+            else 0.0,
+            "acquire_time_max": self._acquire_time_max,
+        }
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str],
+        max_batch_size: int,
+        max_delay: float,
+        schema: Optional[str] = None,
+    ) -> None:
+        self.table = table
+        self.columns = tuple(columns)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.schema = schema
+
+        self._pending: List[tuple[Sequence, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+        self._schema_ready = False
+        self._batches = 0
+        self._rows = 0
+        self._failures = 0
+        _batch_writers.append(self)
+        metrics.register_collector(f"batch_writer.{table}", self.stats)
+
+    async def write(self, row: Sequence) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+
+        await future
+
+    async def flush(self) -> None:
+        if self._pending:
+            self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "in_flight": len(self._flushes),
+            "batches": self._batches,
+            "rows": self._rows,
+            "failures": self._failures,
+            "rows_per_batch": self._rows / self._batches if self._batches else 0.0,
+        }
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            # The batch is shared by many requests, so the flush must not run in the
+            # context of the one that started it, its deadline included.
+            task = asyncio.create_task(
+                self._flush(batch), context=contextvars.Context()
+            )
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[tuple[Sequence, asyncio.Future]]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            async with get_database_pool().session() as session:
+                if self.schema and not self._schema_ready:
+                    await session.execute(self.schema)
+                    self._schema_ready = True
+                async with session.transaction():
+                    await session.execute(
+                        _multi_row_insert(self.table, self.columns, len(rows)),
+                        *(value for row in rows for value in row),
+                    )
+        except Exception as exc:
+            self._failures += 1
+            logger.opt(exception=exc).error(
+                "Batch insert failed", table=self.table, rows=len(rows)
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self._batches += 1
+        self._rows += len(rows)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+
+@lru_cache(maxsize=256)
+def _multi_row_insert(table: str, columns: tuple[str, ...], rows: int) -> str:
+    width = len(columns)
+    values = ", ".join(
+        "(" + ", ".join(f"${row * width + column + 1}" for column in range(width)) + ")"
+        for row in range(rows)
+    )
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}"
+
+
+@lru_cache(maxsize=1024)
+def _to_sqlite_parameters(query: str) -> str:
+    return POSITIONAL_PARAMETER.sub(r"?\1", query)
+
+
+def create_driver(url: str, statement_cache_size: int) -> DatabaseDriver:
+    if url.startswith("sqlite:///"):
+        return SQLiteDriver(url.removeprefix("sqlite:///"), statement_cache_size)
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresDriver(url, statement_cache_size)
+    raise ValueError(
+        f"Invalid database URL: {url}. "
+        "The URL must start with sqlite:///, postgresql:// or postgres://."
+    )
+
+
+_pool: Optional[ConnectionPool] = None
+_batch_writers: List[BatchWriter] = []
+
+
+def get_database_pool() -> ConnectionPool:
+    if _pool is None:
+        raise RuntimeError("Database client is not initialized.")
+    return _pool
+
+
+async def get_database_session() -> AsyncIterator[DatabaseSession]:
+    async with get_database_pool().session() as session:
+        yield session
+
+
+def database_enabled() -> bool:
+    return bool(settings.DATABASE_URL)
+
+
 async def init_database_client():
-    return
+    global _pool
+
+    if not database_enabled():
+        logger.info("Database disabled, DATABASE_URL is not set.")
+        return
+
+    pool = ConnectionPool(
+        driver=create_driver(
+            settings.DATABASE_URL, settings.DATABASE_STATEMENT_CACHE_SIZE
+        ),
+        min_size=settings.DATABASE_POOL_MIN_SIZE,
+        max_size=settings.DATABASE_POOL_MAX_SIZE,
+        acquire_timeout=settings.DATABASE_POOL_ACQUIRE_TIMEOUT,
+    )
+    await pool.open()
+    _pool = pool
+    metrics.register_collector("database", pool.stats)
+    logger.debug("Database pool opened", **pool.stats())
 
 
 async def close_database_client():
-    return
+    global _pool
+
+    for writer in _batch_writers:
+        await writer.flush()
+
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -0,0 +1,97 @@
+import asyncio
+import contextvars
+import math
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.exceptions import DeadlineExceededException
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+RouteHandler = Callable[[Request], Coroutine[Any, Any, Response]]
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def get_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    return seconds_until(_deadline.get())
+
+
+def seconds_until(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(deadline - monotonic(), 0.0)
+
+
+def deadline_context(deadline: Optional[float]) -> contextvars.Context:
+    context = contextvars.copy_context()
+    context.run(_deadline.set, deadline)
+    return context
+
+
+def time_budget(timeout: float) -> float:
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+def deadline_exceeded() -> bool:
+    return remaining() == 0.0
+
+
+def check_deadline() -> None:
+    if deadline_exceeded():
+        raise DeadlineExceededException()
+
+
+def route_timeout(path: str) -> Optional[float]:
+    timeout = settings.API_REQUEST_TIMEOUT
+    matched = ""
+    for prefix, prefix_timeout in settings.API_REQUEST_TIMEOUT_PREFIXES.items():
+        if path.startswith(prefix) and len(prefix) > len(matched):
+            matched, timeout = prefix, prefix_timeout
+    return timeout if timeout > 0 else None
+
+
+def request_timeout(request: Request, configured: Optional[float]) -> Optional[float]:
+    header = request.headers.get(settings.API_REQUEST_TIMEOUT_HEADER)
+    if header is None:
+        return configured
+
+    try:
+        requested = float(header)
+    except ValueError:
+        return configured
+    if not math.isfinite(requested) or requested <= 0:
+        return configured
+    return requested if configured is None else min(requested, configured)
+
+
+def with_deadline(handler: RouteHandler, path: str) -> RouteHandler:
+    configured = route_timeout(path)
+
+    async def deadline_handler(request: Request) -> Response:
+        timeout = request_timeout(request, configured)
+        if timeout is None:
+            return await handler(request)
+
+        token = _deadline.set(monotonic() + timeout)
+        try:
+            async with asyncio.timeout(timeout) as scope:
+                return await handler(request)
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            metrics.increment("deadline.exceeded")
+            raise DeadlineExceededException()
+        finally:
+            _deadline.reset(token)
+
+    return deadline_handler
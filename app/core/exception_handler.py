@@ -58,6 +58,7 @@ async def http_exception_handler(request: Request, exc: Exception) -> ORJSONResp
                 "data": data,
             },
         },
+        headers=err.headers,
     )
 
 
@@ -10,10 +10,11 @@ class StandardException(HTTPException):
         status_code: int,
         message: str,
         data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> None:
         self.message = message
         self.data = data or {}
-        super().__init__(status_code=status_code, detail=self.message)
+        super().__init__(status_code=status_code, detail=self.message, headers=headers)
 
 
 class CoreException(StandardException):
@@ -26,3 +27,52 @@ class CoreException(StandardException):
             message=message,
             data={"errors": errors},
         )
+
+
+class DatabasePoolTimeoutException(StandardException):
+    def __init__(self) -> None:
+        message = "Service temporarily unavailable"
+        errors = ["Timed out waiting for a database connection."]
+
+        super().__init__(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            message=message,
+            data={"errors": errors},
+        )
+
+
+class ServiceOverloadedException(StandardException):
+    def __init__(self) -> None:
+        message = "Service temporarily unavailable"
+        errors = ["The server is handling too many requests, please retry later."]
+
+        super().__init__(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            message=message,
+            data={"errors": errors},
+        )
+
+
+class DeadlineExceededException(StandardException):
+    def __init__(self) -> None:
+        message = "Request timeout"
+        errors = ["The request could not be completed before its deadline."]
+
+        super().__init__(
+            status_code=HTTPStatus.GATEWAY_TIMEOUT,
+            message=message,
+            data={"errors": errors},
+        )
+
+
+class RateLimitExceededException(StandardException):
+    def __init__(self, headers: Dict[str, str]) -> None:
+        message = "Too many requests"
+        errors = ["The rate limit for this API key was exceeded, please retry later."]
+
+        super().__init__(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            message=message,
+            data={"errors": errors},
+            headers=headers,
+        )
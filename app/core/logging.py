@@ -1,37 +1,444 @@
+import gzip
+import hashlib
+import os
+import shutil
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional, TextIO
 
 import orjson
-import stackprinter
 from loguru import logger
-from pygments import highlight
-from pygments.formatters.terminal256 import Terminal256Formatter
-from pygments.lexers.data import JsonLexer
 
+from app.core.metrics import metrics
 from app.core.settings import settings
 
-lexer = JsonLexer()
-formatter = Terminal256Formatter(style=settings.LOGS_PYGMENTS_STYLE)
 orjson_options = orjson.OPT_NAIVE_UTC
 if settings.ENVIRONMENT_DEBUG:
     orjson_options |= orjson.OPT_INDENT_2
 
+OVERFLOW_POLICIES = ("block", "drop_debug_first", "drop_oldest")
+SINKS = ("stderr", "file")
+COMPRESSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEBUG_LEVEL_NO = logger.level("DEBUG").no
 
-def serialize(record: dict) -> str:
+
+@lru_cache(maxsize=4096)
+def _source(file_name: str, function: str, line: int) -> str:
+    return f"{file_name}:{function}:{line}"
+
+
+_timestamp_cache: tuple = (None, "", "")
+
+
+def _timestamp(time: datetime) -> str:
+    global _timestamp_cache
+
+    key = (
+        time.second,
+        time.minute,
+        time.hour,
+        time.day,
+        time.month,
+        time.year,
+        time.tzinfo,
+    )
+    cached_key, head, offset = _timestamp_cache
+    if key != cached_key:
+        formatted = time.replace(microsecond=0).isoformat()
+        head, offset = formatted[:19], formatted[19:]
+        _timestamp_cache = (key, head, offset)
+
+    microsecond = time.microsecond
+    if microsecond:
+        return f"{head}.{microsecond:06d}{offset}"
+    return head + offset
+
+
+class ExceptionFormatter:
+    def __init__(self, full_limit: int, window: float, max_fingerprints: int) -> None:
+        self.full_limit = full_limit
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.suppressed = 0
+        self._occurrences: dict[str, list[float | int]] = {}
+        self._lock = threading.Lock()
+
+    def format(self, exception) -> dict:
+        fingerprint = self.fingerprint(exception)
+        now = time.monotonic()
+
+        with self._lock:
+            occurrence = self._occurrences.get(fingerprint)
+            if occurrence is None or now - occurrence[0] >= self.window:
+                if len(self._occurrences) >= self.max_fingerprints:
+                    self._evict(now)
+                occurrence = self._occurrences[fingerprint] = [now, 0]
+            occurrence[1] += 1
+            count = int(occurrence[1])
+            if count > self.full_limit:
+                self.suppressed += 1
+
+        if count <= self.full_limit:
+            import stackprinter
+
+            formatted = stackprinter.format(exception)
+        else:
+            formatted = f"{exception.type.__qualname__}: {exception.value}"
+
+        return {
+            "exception": formatted,
+            "exception_fingerprint": fingerprint,
+            "exception_occurrences": count,
+        }
+
+    def fingerprint(self, exception) -> str:
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(
+            f"{exception.type.__module__}.{exception.type.__qualname__}".encode()
+        )
+        traceback = exception.traceback
+        while traceback is not None:
+            code = traceback.tb_frame.f_code
+            digest.update(
+                f"|{code.co_filename}:{code.co_name}:{traceback.tb_lineno}".encode()
+            )
+            traceback = traceback.tb_next
+        return digest.hexdigest()
+
+    def stats(self) -> dict:
+        return {"fingerprints": len(self._occurrences), "suppressed": self.suppressed}
+
+    def _evict(self, now: float) -> None:
+        expired = [
+            fingerprint
+            for fingerprint, occurrence in self._occurrences.items()
+            if now - occurrence[0] >= self.window
+        ]
+        for fingerprint in (
+            expired or list(self._occurrences)[: self.max_fingerprints // 2]
+        ):
+            del self._occurrences[fingerprint]
+
+
+exception_formatter = ExceptionFormatter(
+    full_limit=settings.LOGS_EXCEPTION_FULL_LIMIT,
+    window=settings.LOGS_EXCEPTION_WINDOW,
+    max_fingerprints=settings.LOGS_EXCEPTION_MAX_FINGERPRINTS,
+)
+
+
+def serialize(record: dict, pretty: bool = settings.ENVIRONMENT_DEBUG) -> str:
     subset = {
-        "timestamp": record["time"].isoformat(),
+        "timestamp": _timestamp(record["time"]),
         "level": record["level"].name,
         "message": record["message"],
-        "source": f"{record['file'].name}:{record['function']}:{record['line']}",
+        "source": _source(record["file"].name, record["function"], record["line"]),
     }
-    subset.update(record["extra"])
+    if record["extra"]:
+        subset.update(record["extra"])
     if record["exception"]:
-        subset["exception"] = stackprinter.format(record["exception"])
-    formatted_json = orjson.dumps(subset, default=str, option=orjson_options).decode()
-    if settings.ENVIRONMENT_DEBUG:
-        formatted_json = highlight(formatted_json, lexer, formatter)
+        subset.update(exception_formatter.format(record["exception"]))
+    options = orjson_options if pretty else orjson_options & ~orjson.OPT_INDENT_2
+    formatted_json = orjson.dumps(subset, default=str, option=options).decode()
+    if pretty:
+        formatted_json = _highlighter()(formatted_json)
     return formatted_json
 
 
+@lru_cache(maxsize=1)
+def _highlighter() -> Callable[[str], str]:
+    import pygments
+    from pygments.formatters.terminal256 import Terminal256Formatter
+    from pygments.lexers.data import JsonLexer
+
+    lexer = JsonLexer()
+    formatter = Terminal256Formatter(style=settings.LOGS_PYGMENTS_STYLE)
+    return lambda text: pygments.highlight(text, lexer, formatter)
+
+
+class RotatingFileStream:
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        buffer_size: int,
+        rotation_size: int,
+        rotation_interval: int,
+        compression: str,
+        retention_count: int,
+        retention_days: int,
+    ) -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Invalid log compression: {compression}. "
+                f"The compression must be one of: {', '.join(COMPRESSIONS)}."
+            )
+        if compression == "zstd":
+            import zstandard  # noqa: F401
+
+        self.directory = Path(directory)
+        self.name = name
+        self.path = self.directory / f"{name}.log"
+        self.buffer_size = buffer_size
+        self.rotation_size = rotation_size
+        self.rotation_interval = rotation_interval
+        self.compression = compression
+        self.retention_count = retention_count
+        self.retention_days = retention_days
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._compressor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="loguru-compressor"
+        )
+        self._open()
+
+    def write(self, data: str) -> None:
+        if self._should_rotate():
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data) if data.isascii() else len(data.encode())
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._compressor.shutdown(wait=True)
+
+    def _open(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8", buffering=self.buffer_size)
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+
+    def _should_rotate(self) -> bool:
+        if self.rotation_size and self._size >= self.rotation_size:
+            return True
+        if (
+            self.rotation_interval
+            and time.monotonic() - self._opened_at >= self.rotation_interval
+        ):
+            return True
+        return False
+
+    def _rotate(self) -> None:
+        self._file.close()
+        suffix = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = self.path.with_name(f"{self.name}.{suffix}.log")
+        os.replace(self.path, rotated)
+        self._open()
+        self._compressor.submit(self._archive, rotated)
+
+    def _archive(self, rotated: Path) -> None:
+        try:
+            if self.compression == "gzip":
+                with (
+                    open(rotated, "rb") as src,
+                    gzip.open(f"{rotated}.gz", "wb", compresslevel=6) as dst,
+                ):
+                    shutil.copyfileobj(src, dst, length=1024 * 1024)
+                rotated.unlink()
+            elif self.compression == "zstd":
+                import zstandard
+
+                with open(rotated, "rb") as src, open(f"{rotated}.zst", "wb") as dst:
+                    zstandard.ZstdCompressor().copy_stream(src, dst)
+                rotated.unlink()
+            self._apply_retention()
+        except Exception as exc:
+            print(f"Failed to archive log file {rotated}: {exc!r}", file=sys.__stderr__)
+
+    def _apply_retention(self) -> None:
+        archives = sorted(
+            self.directory.glob(f"{self.name}.*.log{COMPRESSIONS[self.compression]}")
+        )
+        expired = []
+        if self.retention_count and len(archives) > self.retention_count:
+            expired = archives[: len(archives) - self.retention_count]
+        if self.retention_days:
+            cutoff = time.time() - self.retention_days * 86400
+            expired += [
+                archive
+                for archive in archives[len(expired) :]
+                if archive.stat().st_mtime < cutoff
+            ]
+        for archive in expired:
+            archive.unlink(missing_ok=True)
+
+
+class QueuedSink:
+    def __init__(
+        self,
+        max_size: int,
+        batch_size: int,
+        overflow: str,
+        block_timeout: float = 0.05,
+        stream: Optional[TextIO | RotatingFileStream] = None,
+        pretty: bool = settings.ENVIRONMENT_DEBUG,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid log queue overflow policy: {overflow}. "
+                f"The policy must be one of: {', '.join(OVERFLOW_POLICIES)}."
+            )
+
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.stream = stream
+        self.pretty = pretty
+        self.written = 0
+        self.dropped: dict[str, int] = {}
+
+        self._queue: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="loguru-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        record = message.record
+
+        with self._lock:
+            if self._closed:
+                self._write([record])
+                return
+
+            if len(self._queue) >= self.max_size:
+                if self.overflow == "block":
+                    # Logging runs on the event loop thread, so a slow stream may only
+                    # stall the caller for block_timeout before the record is dropped.
+                    if not self._not_full.wait_for(
+                        lambda: len(self._queue) < self.max_size or self._closed,
+                        timeout=self.block_timeout,
+                    ):
+                        self._drop(record)
+                        return
+                    if self._closed:
+                        self._write([record])
+                        return
+                elif self.overflow == "drop_oldest":
+                    self._drop(self._queue.popleft())
+                elif record["level"].no <= DEBUG_LEVEL_NO:
+                    self._drop(record)
+                    return
+                else:
+                    self._drop_debug_first()
+
+            self._queue.append(record)
+            self._not_empty.notify()
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._queue),
+            "written": self.written,
+            "dropped": sum(self.dropped.values()),
+            "dropped_by_level": dict(self.dropped),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join()
+        if isinstance(self.stream, RotatingFileStream):
+            self.stream.close()
+
+    def _drop(self, record: dict) -> None:
+        level = record["level"].name
+        self.dropped[level] = self.dropped.get(level, 0) + 1
+
+    def _drop_debug_first(self) -> None:
+        for queued in self._queue:
+            if queued["level"].no <= DEBUG_LEVEL_NO:
+                self._queue.remove(queued)
+                self._drop(queued)
+                return
+        self._drop(self._queue.popleft())
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+                if not self._queue:
+                    return
+                batch = [
+                    self._queue.popleft()
+                    for _ in range(min(self.batch_size, len(self._queue)))
+                ]
+                self._not_full.notify_all()
+
+            self._write(batch)
+
+    def _write(self, batch: list[dict]) -> None:
+        stream = self.stream or sys.stderr
+        try:
+            stream.write(
+                "".join(serialize(record, self.pretty) + "\n" for record in batch)
+            )
+            stream.flush()
+            self.written += len(batch)
+        except Exception as exc:
+            print(
+                f"Failed to write {len(batch)} log records: {exc!r}",
+                file=sys.__stderr__,
+            )
+
+
+_sink: Optional[QueuedSink] = None
+
+
 def init_loguru() -> None:
+    global _sink
+
     logger.remove()
-    logger.add(lambda message: print(serialize(message.record), file=sys.stderr))  # type: ignore
+    if _sink is not None:
+        _sink.close()
+
+    if settings.LOGS_SINK not in SINKS:
+        raise ValueError(
+            f"Invalid log sink: {settings.LOGS_SINK}. "
+            f"The sink must be one of: {', '.join(SINKS)}."
+        )
+
+    stream = None
+    if settings.LOGS_SINK == "file":
+        stream = RotatingFileStream(
+            directory=settings.LOGS_PATH,
+            name=settings.LOGS_NAME,
+            buffer_size=settings.LOGS_FILE_BUFFER_SIZE,
+            rotation_size=settings.LOGS_ROTATION_SIZE,
+            rotation_interval=settings.LOGS_ROTATION_INTERVAL,
+            compression=settings.LOGS_COMPRESSION,
+            retention_count=settings.LOGS_RETENTION_COUNT,
+            retention_days=settings.LOGS_RETENTION_DAYS,
+        )
+
+    _sink = QueuedSink(
+        max_size=settings.LOGS_QUEUE_SIZE,
+        batch_size=settings.LOGS_QUEUE_BATCH_SIZE,
+        overflow=settings.LOGS_QUEUE_OVERFLOW,
+        block_timeout=settings.LOGS_QUEUE_BLOCK_TIMEOUT,
+        stream=stream,
+        pretty=settings.ENVIRONMENT_DEBUG and stream is None,
+    )
+    logger.add(_sink, level=settings.LOGS_LEVEL)  # type: ignore
+    metrics.register_collector("logs", _sink.stats)
+    metrics.register_collector("exceptions", exception_formatter.stats)
+
+
+def close_loguru() -> None:
+    if _sink is not None:
+        _sink.close()
@@ -0,0 +1,26 @@
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any, Dict
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._counters: defaultdict[str, int] = defaultdict(int)
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def register_collector(
+        self, name: str, collector: Callable[[], Dict[str, Any]]
+    ) -> None:
+        self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = {"counters": dict(self._counters)}
+        for name, collector in self._collectors.items():
+            snapshot[name] = collector()
+        return snapshot
+
+
+metrics = MetricsRegistry()
@@ -1,153 +1,442 @@
-from collections.abc import Callable
+import asyncio
+from collections import deque
+from http import HTTPStatus
+from random import random
 from secrets import token_urlsafe
-from time import time
+from time import monotonic, perf_counter_ns
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import orjson
-from fastapi import Request, Response
 from fastapi.responses import ORJSONResponse
-from hypercorn.logging import AccessLogAtoms
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.exceptions import CoreException
+from app.core.exceptions import (
+    CoreException,
+    ServiceOverloadedException,
+    StandardException,
+)
+from app.core.metrics import metrics
+from app.core.responses import SUCCESS_MESSAGE
 from app.core.settings import settings
 from app.core.utils import _current_timestamp
 
+UNFORMATTED_PATHS = frozenset({"/openapi.json", "/docs", "/redoc"})
+ENVELOPE_SUFFIX = b"}}"
+ENVELOPE_CHECK_MAX_SIZE = 64 * 1024
 
-async def log_request_middleware(request: Request, call_next: Callable) -> Response:
-    start_time = time()
-    request_id: str = token_urlsafe(settings.LOGS_REQUEST_ID_LENGTH)
-    exception = None
 
-    with logger.contextualize(request_id=request_id):
-        try:
-            logger.info(
-                "Received request",
-                method=request.method,
-                path=request.url.path,
-                query=request.url.query,
-                content_type=request.headers.get("content-type"),
-                user_agent=request.headers.get("user-agent"),
-                host=request.headers.get("host"),
-                content_length=request.headers.get("content-length"),
-                client_ip=request.client.host,
-            )
+class AccessLogMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.sample_rate = settings.LOGS_ACCESS_SAMPLE_RATE
+        self.path_sample_rates = settings.LOGS_ACCESS_PATH_SAMPLE_RATES
+        self.slow_threshold_ns = int(settings.LOGS_ACCESS_SLOW_THRESHOLD * 1e9)
+        minimum_level = logger.level(settings.LOGS_LEVEL).no
+        self.info_enabled = minimum_level <= logger.level("INFO").no
+        self.success_enabled = minimum_level <= logger.level("SUCCESS").no
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = perf_counter_ns()
+        request_id: str = token_urlsafe(settings.LOGS_REQUEST_ID_LENGTH)
+        status_code = HTTPStatus.INTERNAL_SERVER_ERROR
+        response_length = 0
+        response_started = False
+
+        sample_rate = self.path_sample_rates.get(scope["path"], self.sample_rate)
+        sampled = sample_rate >= 1 or (sample_rate > 0 and random() < sample_rate)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_length, response_started
+
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                elapsed = (perf_counter_ns() - start_time) / 1e9
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("X-Request-ID", request_id)
+                response_headers.append("X-Processed-Time", str(elapsed))
+            elif message["type"] == "http.response.body":
+                response_length += len(message.get("body", b""))
 
-            response = await call_next(request)
-        except Exception as exc:
-            exception = exc
-            core_exc = CoreException()
-            response = ORJSONResponse(
-                status_code=core_exc.status_code,
-                content={
-                    "code": core_exc.status_code,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "timestamp": _current_timestamp(),
-                    "details": {"message": core_exc.message, "data": core_exc.data},
-                },
+            await send(message)
+
+        with logger.contextualize(request_id=request_id):
+            if sampled and self.info_enabled:
+                headers = Headers(scope=scope)
+                client = scope.get("client")
+                logger.info(
+                    "Received request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    query=scope["query_string"].decode("latin-1"),
+                    content_type=headers.get("content-type"),
+                    user_agent=headers.get("user-agent"),
+                    host=headers.get("host"),
+                    content_length=headers.get("content-length"),
+                    client_ip=client[0] if client else None,
+                )
+
+            exception = None
+            reraise = False
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception as exc:
+                exception = exc
+                # Once the response has started no error response can be sent, so
+                # the exception is logged with the status already sent and re-raised.
+                reraise = response_started
+                if not reraise:
+                    await _core_exception_response(scope)(scope, receive, send_wrapper)
+
+            elapsed_ns = perf_counter_ns() - start_time
+            if exception is not None or status_code >= 500:
+                metrics.increment("access_log.forced_error")
+            elif elapsed_ns >= self.slow_threshold_ns:
+                metrics.increment("access_log.forced_slow")
+            elif sampled:
+                metrics.increment("access_log.sampled")
+                if not self.success_enabled:
+                    return
+            else:
+                metrics.increment("access_log.dropped")
+                return
+
+            data = _access_log_data(
+                scope, status_code, response_length, elapsed_ns / 1e9
             )
-        final_time = time()
-        elapsed = final_time - start_time
-        response_dict = {
-            "status": response.status_code,
-            "headers": response.headers.raw if hasattr(response, "headers") else {},
-        }
 
-        atoms = AccessLogAtoms(request, response_dict, final_time)  # type: ignore
-
-        data = {
-            "remote_ip": request.headers.get("x-forwarded-for") or atoms["h"],
-            "schema": request.headers.get("x-forwarded-proto") or atoms["S"],
-            "protocol": atoms["H"],
-            "method": atoms["m"],
-            "path_with_query": atoms["Uq"],
-            "status_code": response.status_code,
-            "response_length": atoms["B"],
-            "elapsed": elapsed,
-            "referer": atoms["f"],
-            "user_agent": atoms["a"],
+            if not exception:
+                logger.success("Request processed successfully", **data)
+            else:
+                logger.opt(exception=exception).error(
+                    "Unhandled exception occurred", **data
+                )
+                if reraise:
+                    raise exception
+
+
+def _access_log_data(
+    scope: Scope, status_code: int, response_length: int, elapsed: float
+) -> dict:
+    headers = Headers(scope=scope)
+    client = scope.get("client")
+    return {
+        "remote_ip": headers.get("x-forwarded-for")
+        or (f"{client[0]}:{client[1]}" if client else "-"),
+        "schema": headers.get("x-forwarded-proto") or scope["scheme"],
+        "protocol": scope["http_version"],
+        "method": scope["method"],
+        "path_with_query": _path_with_query(scope),
+        "status_code": status_code,
+        "response_length": response_length,
+        "elapsed": elapsed,
+        "referer": headers.get("referer", "-"),
+        "user_agent": headers.get("user-agent", "-"),
+    }
+
+
+def _core_exception_response(scope: Scope) -> ORJSONResponse:
+    return _exception_response(scope, CoreException())
+
+
+def _exception_response(
+    scope: Scope, exc: StandardException, headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "code": exc.status_code,
+            "method": scope["method"],
+            "path": scope["path"],
+            "timestamp": _current_timestamp(),
+            "details": {"message": exc.message, "data": exc.data},
+        },
+        headers=headers,
+    )
+
+
+def _path_with_query(scope: Scope) -> str:
+    query_string = scope["query_string"]
+    if not query_string:
+        return scope["path"]
+    return f"{scope['path']}?{query_string.decode('latin-1')}"
+
+
+class ConcurrencyLimiter:
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        target_latency: float = 0.5,
+        backoff: float = 0.9,
+    ) -> None:
+        self.name = name
+        self.max_limit = limit
+        self.limit = float(limit)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.adaptive = adaptive
+        self.min_limit = min(min_limit, limit)
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.accepted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._last_decrease = 0.0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit) and not self.waiters:
+            self.in_flight += 1
+            self.accepted += 1
+            return True
+
+        if len(self.waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        self.queued += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except TimeoutError:
+            if not future.cancelled():
+                self.accepted += 1
+                return True
+            self._discard(future)
+            self.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._discard(future)
+            raise
+
+        self.accepted += 1
+        return True
+
+    def release(self, latency: Optional[float] = None) -> None:
+        if self.adaptive and latency is not None:
+            self._adapt(latency)
+
+        while self.waiters and self.in_flight <= int(self.limit):
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self.waiters),
+            "accepted": self.accepted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
         }
 
-        if not exception:
-            logger.success("Request processed successfully", **data)
-        else:
-            logger.opt(exception=exception).error(
-                "Unhandled exception occurred", **data
-            )
+    def _adapt(self, latency: float) -> None:
+        if latency > self.target_latency:
+            now = monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self.limit = max(self.limit * self.backoff, self.min_limit)
+        elif self.in_flight >= int(self.limit):
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
 
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Processed-Time"] = str(elapsed)
+    def _discard(self, future: asyncio.Future) -> None:
+        try:
+            self.waiters.remove(future)
+        except ValueError:
+            pass
 
-    return response
 
+class ConcurrencyLimitMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.exempt_paths = frozenset(settings.CONCURRENCY_EXEMPT_PATHS)
+        self.retry_after = str(settings.CONCURRENCY_RETRY_AFTER)
+        self.limiter = (
+            _concurrency_limiter("global", settings.CONCURRENCY_LIMIT)
+            if settings.CONCURRENCY_LIMIT > 0
+            else None
+        )
+        self.prefix_limiters: List[Tuple[str, ConcurrencyLimiter]] = sorted(
+            (
+                (prefix, _concurrency_limiter(prefix, limit))
+                for prefix, limit in settings.CONCURRENCY_PREFIX_LIMITS.items()
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        metrics.register_collector("concurrency", self.stats)
 
-class ResponseFormattingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
 
-        if request.url.path in ["/openapi.json", "/docs", "/redoc"]:
-            logger.debug(
-                "Skipping response formatting for OpenAPI documentation endpoints."
-            )
-            return response
+        limiters = [
+            limiter
+            for limiter in (self._prefix_limiter(scope["path"]), self.limiter)
+            if limiter is not None
+        ]
+        acquired: List[ConcurrencyLimiter] = []
+        for limiter in limiters:
+            if not await limiter.acquire():
+                for held in acquired:
+                    held.release()
+                await _exception_response(
+                    scope,
+                    ServiceOverloadedException(),
+                    headers={"Retry-After": self.retry_after},
+                )(scope, receive, send)
+                return
+            acquired.append(limiter)
+
+        start = monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            latency = monotonic() - start
+            for limiter in acquired:
+                limiter.release(latency)
 
-        if 200 <= response.status_code < 300:
-            raw_body = b""
-            async for chunk in response.body_iterator:
-                raw_body += chunk
+    def stats(self) -> Dict[str, Any]:
+        limiters = [limiter for _, limiter in self.prefix_limiters]
+        if self.limiter is not None:
+            limiters.append(self.limiter)
+        return {limiter.name: limiter.stats() for limiter in limiters}
 
-            try:
-                original_data = orjson.loads(raw_body)
-
-                formatted = {
-                    "code": response.status_code,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "timestamp": _current_timestamp(),
-                    "details": {
-                        "message": "Request processed successfully.",
-                        "data": original_data,
-                    },
-                }
-
-                safe_headers = {}
-                for key, value in response.headers.items():
-                    if key.lower() not in [
-                        "content-length",
-                        "content-encoding",
-                        "transfer-encoding",
-                    ]:
-                        safe_headers[key] = value
-
-                logger.debug("Returning formatted response")
-
-                return ORJSONResponse(
-                    status_code=response.status_code,
-                    content=formatted,
-                    headers=safe_headers,
-                )
-            except orjson.JSONDecodeError:
-                safe_headers = {}
-                for key, value in response.headers.items():
-                    if key.lower() not in [
-                        "content-length",
-                        "content-encoding",
-                        "transfer-encoding",
-                    ]:
-                        safe_headers[key] = value
-
-                logger.debug(
-                    "Returning raw response due to JSON decode error", raw_body=raw_body
+    def _prefix_limiter(self, path: str) -> Optional[ConcurrencyLimiter]:
+        for prefix, limiter in self.prefix_limiters:
+            if path.startswith(prefix):
+                return limiter
+        return None
+
+
+def _concurrency_limiter(name: str, limit: int) -> ConcurrencyLimiter:
+    return ConcurrencyLimiter(
+        name,
+        limit,
+        max_queue=settings.CONCURRENCY_MAX_QUEUE,
+        queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT,
+        adaptive=settings.CONCURRENCY_ADAPTIVE,
+        min_limit=settings.CONCURRENCY_ADAPTIVE_MIN_LIMIT,
+        target_latency=settings.CONCURRENCY_ADAPTIVE_TARGET_LATENCY,
+        backoff=settings.CONCURRENCY_ADAPTIVE_BACKOFF,
+    )
+
+
+class ResponseFormattingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or scope["path"] in UNFORMATTED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        prefix = b""
+        formatting = False
+        wrapped = False
+        start_message: Optional[Message] = None
+        buffered = bytearray()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal prefix, formatting, wrapped, start_message
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                content_length = headers.get("content-length")
+                formatting = (
+                    200 <= message["status"] < 300
+                    and content_length != "0"
+                    and "content-encoding" not in headers
+                    and headers.get("content-type", "").startswith("application/json")
                 )
+                if not formatting:
+                    await send(message)
+                    return
 
-                return Response(
-                    content=raw_body,
-                    status_code=response.status_code,
-                    headers=safe_headers,
-                    media_type=response.media_type,
+                prefix = _envelope_prefix(
+                    message["status"], scope["method"], scope["path"]
                 )
+                # A small body of known length is checked to be JSON before it is
+                # wrapped, and is sent as is otherwise. Larger and chunked bodies are
+                # wrapped as they stream without being parsed.
+                if (
+                    content_length is not None
+                    and int(content_length) <= ENVELOPE_CHECK_MAX_SIZE
+                ):
+                    start_message = message
+                    return
+                if content_length is not None:
+                    headers["content-length"] = str(
+                        int(content_length) + len(prefix) + len(ENVELOPE_SUFFIX)
+                    )
+
+            elif message["type"] == "http.response.body" and start_message is not None:
+                buffered.extend(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+
+                body = bytes(buffered)
+                try:
+                    orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    pass
+                else:
+                    body = prefix + body + ENVELOPE_SUFFIX
+                    MutableHeaders(scope=start_message)["content-length"] = str(
+                        len(body)
+                    )
+                await send(start_message)
+                message = {**message, "body": body}
+
+            elif message["type"] == "http.response.body" and formatting:
+                body = message.get("body", b"")
+                if body and not wrapped:
+                    body = prefix + body
+                    wrapped = True
+                if wrapped and not message.get("more_body", False):
+                    body += ENVELOPE_SUFFIX
+                message = {**message, "body": body}
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
-        logger.debug("Returning response without formatting")
 
-        return response
+def _envelope_prefix(status_code: int, method: str, path: str) -> bytes:
+    return (
+        b'{"code":%d,"method":%b,"path":%b,"timestamp":%b,"details":{"message":%b,"data":'
+        % (
+            status_code,
+            orjson.dumps(method),
+            orjson.dumps(path),
+            orjson.dumps(_current_timestamp()),
+            orjson.dumps(SUCCESS_MESSAGE),
+        )
+    )
@@ -0,0 +1,89 @@
+import importlib
+import resource
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import FastAPI
+
+from app.core.metrics import metrics
+
+MODULES_PACKAGE = "app.modules"
+MODULES_PATH = Path(__file__).resolve().parent.parent / "modules"
+ROUTERS_MODULE = "presentation.routers"
+
+
+@dataclass(frozen=True)
+class ModuleRegistration:
+    name: str
+    routes: int
+    import_time: float
+    memory: int
+
+
+class ModuleRegistry:
+    def __init__(self) -> None:
+        self.registrations: List[ModuleRegistration] = []
+
+    def discover(self) -> List[str]:
+        return sorted(
+            path.parent.parent.name
+            for path in MODULES_PATH.glob("*/presentation/routers.py")
+            if not path.parent.parent.name.startswith(("_", "."))
+        )
+
+    def register(self, app: FastAPI, enabled: Optional[Sequence[str]] = None) -> None:
+        available = self.discover()
+        if enabled:
+            unknown = sorted(set(enabled) - set(available))
+            if unknown:
+                raise ValueError(
+                    f"Invalid modules: {', '.join(unknown)}. "
+                    f"Available modules are: {', '.join(available)}."
+                )
+            selected = [name for name in available if name in enabled]
+        else:
+            selected = available
+
+        for name in selected:
+            self.registrations.append(self._register(app, name))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            registration.name: {
+                "routes": registration.routes,
+                "import_time": registration.import_time,
+                "memory": registration.memory,
+            }
+            for registration in self.registrations
+        }
+
+    def _register(self, app: FastAPI, name: str) -> ModuleRegistration:
+        memory = _rss_bytes()
+        start = perf_counter()
+
+        router = importlib.import_module(
+            f"{MODULES_PACKAGE}.{name}.{ROUTERS_MODULE}"
+        ).router
+        routes = len(app.routes)
+        app.include_router(router)
+
+        return ModuleRegistration(
+            name=name,
+            routes=len(app.routes) - routes,
+            import_time=perf_counter() - start,
+            memory=max(_rss_bytes() - memory, 0),
+        )
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+module_registry = ModuleRegistry()
+metrics.register_collector("modules", module_registry.stats)
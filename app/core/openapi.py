@@ -0,0 +1,158 @@
+import gzip
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Optional
+
+import orjson
+from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import HTMLResponse
+from loguru import logger
+
+from app.core.settings import settings
+
+OPENAPI_URL = "/openapi.json"
+OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
+ENCODINGS = ("br", "gzip")
+
+
+@dataclass(frozen=True)
+class OpenAPIDocument:
+    body: bytes
+    etag: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> "OpenAPIDocument":
+        variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        brotli = _brotli()
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=11)
+
+        etag = blake2b(body, digest_size=16).hexdigest()
+        return cls(body=body, etag=etag, variants=variants)
+
+    def response(self, request: Request) -> Response:
+        encoding = _negotiate_encoding(
+            request.headers.get("accept-encoding", ""), self.variants
+        )
+        etag = f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+        headers = {
+            "etag": etag,
+            "vary": "Accept-Encoding",
+            "cache-control": "no-cache",
+        }
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["content-encoding"] = encoding
+        return Response(
+            content=self.variants[encoding] if encoding else self.body,
+            media_type="application/json",
+            headers=headers,
+        )
+
+
+def build_openapi_document(app: FastAPI) -> OpenAPIDocument:
+    return OpenAPIDocument.from_bytes(orjson.dumps(app.openapi()))
+
+
+def load_openapi_document(app: FastAPI) -> OpenAPIDocument:
+    path = settings.OPENAPI_PREBUILT_PATH
+    if path and Path(path).is_file():
+        document = OpenAPIDocument.from_bytes(Path(path).read_bytes())
+        logger.debug("OpenAPI document loaded", path=path, size=len(document.body))
+    else:
+        if path:
+            logger.warning(
+                "Prebuilt OpenAPI document not found, generating it", path=path
+            )
+        document = build_openapi_document(app)
+        logger.debug("OpenAPI document generated", size=len(document.body))
+
+    app.state.openapi_document = document
+    return document
+
+
+def get_openapi_document(app: FastAPI) -> OpenAPIDocument:
+    document: Optional[OpenAPIDocument] = getattr(app.state, "openapi_document", None)
+    return document if document is not None else load_openapi_document(app)
+
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get(OPENAPI_URL)
+async def openapi(request: Request) -> Response:
+    return get_openapi_document(request.app).response(request)
+
+
+@router.get("/docs")
+async def swagger_ui(request: Request) -> HTMLResponse:
+    root_path = _root_path(request)
+    return get_swagger_ui_html(
+        openapi_url=root_path + OPENAPI_URL,
+        title=f"{settings.APPLICATION_TITLE} - Swagger UI",
+        oauth2_redirect_url=root_path + OAUTH2_REDIRECT_URL,
+        init_oauth=request.app.swagger_ui_init_oauth,
+        swagger_ui_parameters=request.app.swagger_ui_parameters,
+    )
+
+
+@router.get(OAUTH2_REDIRECT_URL)
+async def swagger_ui_redirect() -> HTMLResponse:
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@router.get("/redoc")
+async def redoc(request: Request) -> HTMLResponse:
+    return get_redoc_html(
+        openapi_url=_root_path(request) + OPENAPI_URL,
+        title=f"{settings.APPLICATION_TITLE} - ReDoc",
+    )
+
+
+def _root_path(request: Request) -> str:
+    return request.scope.get("root_path", "").rstrip("/")
+
+
+def _negotiate_encoding(accept_encoding: str, variants: Dict[str, bytes]) -> str:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        if quality and quality.replace(".", "").strip("0") == "":
+            continue
+        accepted.add(name.strip())
+
+    for encoding in ENCODINGS:
+        if encoding in variants and (encoding in accepted or "*" in accepted):
+            return encoding
+    return ""
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _brotli():
+    try:
+        import brotli
+
+        return brotli
+    except ImportError:
+        return None
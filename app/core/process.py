@@ -0,0 +1,51 @@
+import os
+import resource
+from typing import Dict
+
+from app.core.metrics import metrics
+
+SMAPS_FIELDS = {
+    b"Rss:": "rss",
+    b"Pss:": "pss",
+    b"Shared_Clean:": "shared",
+    b"Shared_Dirty:": "shared",
+    b"Private_Clean:": "uss",
+    b"Private_Dirty:": "uss",
+}
+
+
+def memory_usage() -> Dict[str, int]:
+    try:
+        return _smaps_rollup()
+    except OSError:
+        pass
+
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            _, resident, shared = (int(value) for value in statm.read().split()[:3])
+        page = resource.getpagesize()
+        return {
+            "rss": resident * page,
+            "shared": shared * page,
+            "uss": (resident - shared) * page,
+        }
+    except OSError:
+        return {"rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+
+
+def process_stats() -> Dict[str, int]:
+    return {"pid": os.getpid(), **memory_usage()}
+
+
+def _smaps_rollup() -> Dict[str, int]:
+    usage = {"rss": 0, "pss": 0, "shared": 0, "uss": 0}
+    with open("/proc/self/smaps_rollup", "rb") as smaps:
+        for line in smaps:
+            name, _, rest = line.partition(b" ")
+            key = SMAPS_FIELDS.get(name)
+            if key is not None:
+                usage[key] += int(rest.split()[0]) * 1024
+    return usage
+
+
+metrics.register_collector("process", process_stats)
@@ -0,0 +1,409 @@
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request, Response, Security
+
+from app.core.exceptions import RateLimitExceededException
+from app.core.metrics import metrics
+from app.core.security import api_key_auth
+from app.core.settings import settings
+
+RATE_LIMIT_ALGORITHMS = ("token_bucket", "sliding_window")
+RATE_LIMIT_BACKENDS = ("memory", "redis")
+
+TOKEN_BUCKET_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.replicate_commands()
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or limit
+local updated = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + (now - updated) * limit / window)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.replicate_commands()
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local index = math.floor(now / window)
+local elapsed = now - index * window
+local current_key = KEYS[1] .. ':' .. index
+local current = tonumber(redis.call('GET', current_key)) or 0
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (index - 1))) or 0
+local allowed = 0
+if previous * (1 - elapsed / window) + current + 1 <= limit then
+    current = redis.call('INCR', current_key)
+    redis.call('PEXPIRE', current_key, math.ceil(window * 2000))
+    allowed = 1
+end
+return {allowed, previous, current, tostring(elapsed)}
+"""
+
+TOKEN_BUCKET_REFUND_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(limit, tokens + 1)))
+end
+return 0
+"""
+
+SLIDING_WINDOW_REFUND_SCRIPT = """
+local window = tonumber(ARGV[1])
+redis.replicate_commands()
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local current_key = KEYS[1] .. ':' .. math.floor(now / window)
+if (tonumber(redis.call('GET', current_key)) or 0) > 0 then
+    redis.call('DECR', current_key)
+end
+return 0
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+    retry_after: float
+    window: float
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset)),
+            "RateLimit-Policy": f"{self.limit};w={math.ceil(self.window)}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+def token_bucket_result(
+    allowed: bool, tokens: float, limit: int, window: float
+) -> RateLimitResult:
+    rate = limit / window
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=int(tokens),
+        reset=(limit - tokens) / rate,
+        retry_after=0.0 if allowed else (1 - tokens) / rate,
+        window=window,
+    )
+
+
+def sliding_window_result(
+    allowed: bool,
+    previous: int,
+    current: int,
+    elapsed: float,
+    limit: int,
+    window: float,
+) -> RateLimitResult:
+    used = previous * (1 - elapsed / window) + current
+    reset = window - elapsed
+    if allowed:
+        retry_after = 0.0
+    elif current < limit:
+        retry_after = window * (1 - (limit - 1 - current) / previous) - elapsed
+    else:
+        retry_after = reset + window * (1 - (limit - 1) / current)
+
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(int(limit - used), 0),
+        reset=reset,
+        retry_after=max(retry_after, 0.0),
+        window=window,
+    )
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def token_bucket(
+        self, key: str, limit: int, window: float
+    ) -> RateLimitResult: ...
+
+    @abstractmethod
+    async def sliding_window(
+        self, key: str, limit: int, window: float
+    ) -> RateLimitResult: ...
+
+    @abstractmethod
+    async def token_bucket_refund(
+        self, key: str, limit: int, window: float
+    ) -> None: ...
+
+    @abstractmethod
+    async def sliding_window_refund(
+        self, key: str, limit: int, window: float
+    ) -> None: ...
+
+    async def close(self) -> None:
+        return None
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, shards: int, max_keys: int) -> None:
+        self._shards: List[OrderedDict[str, List[float]]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self.max_shard_size = max(max_keys // shards, 1)
+        self._evictions = 0
+
+    async def token_bucket(
+        self, key: str, limit: int, window: float
+    ) -> RateLimitResult:
+        now = monotonic()
+        state = self._state(key)
+        if state is None:
+            state = self._create(key, [limit, now])
+
+        tokens = min(limit, state[0] + (now - state[1]) * limit / window)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        state[0] = tokens
+        state[1] = now
+        return token_bucket_result(allowed, tokens, limit, window)
+
+    async def sliding_window(
+        self, key: str, limit: int, window: float
+    ) -> RateLimitResult:
+        now = monotonic()
+        index = now // window
+        state = self._state(key)
+        if state is None:
+            state = self._create(key, [index, 0, 0])
+        elif state[0] != index:
+            state[2] = state[1] if state[0] == index - 1 else 0
+            state[1] = 0
+            state[0] = index
+
+        elapsed = now - index * window
+        allowed = state[2] * (1 - elapsed / window) + state[1] + 1 <= limit
+        if allowed:
+            state[1] += 1
+        return sliding_window_result(
+            allowed, int(state[2]), int(state[1]), elapsed, limit, window
+        )
+
+    async def token_bucket_refund(self, key: str, limit: int, window: float) -> None:
+        state = self._state(key)
+        if state is not None:
+            state[0] = min(limit, state[0] + 1)
+
+    async def sliding_window_refund(self, key: str, limit: int, window: float) -> None:
+        state = self._state(key)
+        if state is not None and state[0] == monotonic() // window and state[1] > 0:
+            state[1] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "keys": sum(len(shard) for shard in self._shards),
+            "evictions": self._evictions,
+        }
+
+    def _state(self, key: str) -> Optional[List[float]]:
+        shard = self._shards[hash(key) % len(self._shards)]
+        state = shard.get(key)
+        if state is not None:
+            shard.move_to_end(key)
+        return state
+
+    def _create(self, key: str, state: List[float]) -> List[float]:
+        shard = self._shards[hash(key) % len(self._shards)]
+        if len(shard) >= self.max_shard_size:
+            shard.popitem(last=False)
+            self._evictions += 1
+        shard[key] = state
+        return state
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    def __init__(self, url: str, namespace: str) -> None:
+        self.namespace = namespace
+        from redis.asyncio import from_url
+
+        self._redis = from_url(url)
+        self._token_bucket = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._sliding_window = self._redis.register_script(SLIDING_WINDOW_SCRIPT)
+        self._token_bucket_refund = self._redis.register_script(
+            TOKEN_BUCKET_REFUND_SCRIPT
+        )
+        self._sliding_window_refund = self._redis.register_script(
+            SLIDING_WINDOW_REFUND_SCRIPT
+        )
+
+    async def token_bucket(
+        self, key: str, limit: int, window: float
+    ) -> RateLimitResult:
+        allowed, tokens = await self._token_bucket(
+            keys=[self._key(key)], args=[limit, window]
+        )
+        return token_bucket_result(bool(allowed), float(tokens), limit, window)
+
+    async def sliding_window(
+        self, key: str, limit: int, window: float
+    ) -> RateLimitResult:
+        allowed, previous, current, elapsed = await self._sliding_window(
+            keys=[self._key(key)], args=[limit, window]
+        )
+        return sliding_window_result(
+            bool(allowed), int(previous), int(current), float(elapsed), limit, window
+        )
+
+    async def token_bucket_refund(self, key: str, limit: int, window: float) -> None:
+        await self._token_bucket_refund(keys=[self._key(key)], args=[limit])
+
+    async def sliding_window_refund(self, key: str, limit: int, window: float) -> None:
+        await self._sliding_window_refund(keys=[self._key(key)], args=[window])
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "namespace": self.namespace}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{{{key}}}"
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        algorithm: str,
+        limit: int,
+        window: float,
+        route_limits: Dict[str, int],
+    ) -> None:
+        if algorithm not in RATE_LIMIT_ALGORITHMS:
+            raise ValueError(
+                f"Invalid rate limit algorithm: {algorithm}. "
+                f"Valid algorithms are: {', '.join(RATE_LIMIT_ALGORITHMS)}."
+            )
+
+        self.backend = backend
+        self.algorithm = algorithm
+        self.limit = limit
+        self.window = window
+        self.route_limits = sorted(
+            route_limits.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self._hit = getattr(backend, algorithm)
+        self._refund = getattr(backend, f"{algorithm}_refund")
+        self._allowed = 0
+        self._limited = 0
+
+    async def check(
+        self, client: str, quota: Optional[int], path: str
+    ) -> RateLimitResult:
+        result = None
+        for prefix, route_limit in self.route_limits:
+            if path.startswith(prefix):
+                route_key = f"{client}:{prefix}"
+                result = await self._hit(route_key, route_limit, self.window)
+                if not result.allowed:
+                    self._limited += 1
+                    return result
+                break
+
+        client_result = await self._hit(
+            client, self.limit if quota is None else max(quota, 1), self.window
+        )
+        if not client_result.allowed:
+            # The request is not served, so the route token taken above is returned.
+            if result is not None:
+                await self._refund(route_key, route_limit, self.window)
+            self._limited += 1
+            return client_result
+
+        self._allowed += 1
+        if result is not None and result.remaining < client_result.remaining:
+            return result
+        return client_result
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "algorithm": self.algorithm,
+            "allowed": self._allowed,
+            "limited": self._limited,
+            **self.backend.stats(),
+        }
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimitBackend(
+            settings.RATE_LIMIT_SHARDS, settings.RATE_LIMIT_MAX_KEYS
+        )
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(
+            settings.RATE_LIMIT_REDIS_URL, settings.RATE_LIMIT_NAMESPACE
+        )
+    raise ValueError(
+        f"Invalid rate limit backend: {settings.RATE_LIMIT_BACKEND}. "
+        f"Valid backends are: {', '.join(RATE_LIMIT_BACKENDS)}."
+    )
+
+
+rate_limiter = RateLimiter(
+    create_rate_limit_backend(),
+    algorithm=settings.RATE_LIMIT_ALGORITHM,
+    limit=settings.RATE_LIMIT_DEFAULT_LIMIT,
+    window=settings.RATE_LIMIT_WINDOW,
+    route_limits=settings.RATE_LIMIT_ROUTE_LIMITS,
+)
+metrics.register_collector("rate_limit", rate_limiter.stats)
+
+
+async def rate_limit(
+    request: Request,
+    response: Response,
+    api_key: str = Security(api_key_auth),  # noqa: ARG001
+) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    key = request.state.api_key
+    result = await rate_limiter.check(key.key_hash, key.quota, request.scope["path"])
+    headers = result.headers()
+    if not result.allowed:
+        raise RateLimitExceededException(headers)
+    response.headers.raw.extend(
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    )
+
+
+async def close_rate_limiter() -> None:
+    await rate_limiter.close()
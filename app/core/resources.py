@@ -4,21 +4,31 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from loguru import logger
 
-from app.core.database import init_database_client, close_database_client
-from app.core.logging import init_loguru
+from app.core.api_keys import api_key_store
+from app.core.cache import close_caches
+from app.core.database import (
+    close_database_client,
+    database_enabled,
+    init_database_client,
+)
+from app.core.logging import close_loguru, init_loguru
+from app.core.modules import module_registry
+from app.core.openapi import get_openapi_document
+from app.core.process import process_stats
+from app.core.rate_limit import close_rate_limiter
 from app.core.settings import settings
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI) -> AsyncIterator:  # noqa: ARG001
-    await startup()
+async def lifespan(app: FastAPI) -> AsyncIterator:
+    await startup(app)
     try:
         yield
     finally:
         await shutdown()
 
 
-async def startup() -> None:
+async def startup(app: FastAPI) -> None:
     init_loguru()
 
     logger.info(f"Starting {settings.APPLICATION_TITLE}...")
@@ -27,16 +37,43 @@ async def startup() -> None:
             "Running in development mode, this is not recommended for production!"
         )
 
+    for registration in module_registry.registrations:
+        logger.info(
+            f"Module {registration.name} registered.",
+            routes=registration.routes,
+            import_time=registration.import_time,
+            memory=registration.memory,
+        )
+
     await init_database_client()
-    logger.info("Database client initialized successfully.")
+    if database_enabled():
+        logger.info("Database client initialized successfully.")
+
+    await api_key_store.start()
+    logger.info("API key store initialized successfully.")
+
+    get_openapi_document(app)
+    logger.info("OpenAPI document prepared successfully.")
 
-    logger.info(f"{settings.APPLICATION_TITLE} is ready to serve requests.")
+    logger.info(
+        f"{settings.APPLICATION_TITLE} is ready to serve requests.", **process_stats()
+    )
 
 
 async def shutdown() -> None:
     logger.info("Shutting down application...")
 
+    await api_key_store.close()
+    logger.info("API key store closed successfully.")
+
     await close_database_client()
     logger.info("Database client closed successfully.")
 
+    await close_caches()
+    logger.info("Caches closed successfully.")
+
+    await close_rate_limiter()
+    logger.info("Rate limiter closed successfully.")
+
     logger.info(f"{settings.APPLICATION_TITLE} has been shut down successfully.")
+    close_loguru()
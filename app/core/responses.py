@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from starlette.requests import ClientDisconnect
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.settings import settings
+from app.core.utils import _current_timestamp
+
+SUCCESS_MESSAGE = "Request processed successfully."
+
+NO_BODY_STATUS_CODES = (204, 304)
+
+
+class StandardORJSONResponse(ORJSONResponse):
+    def __init__(self, content: Any = None, *args: Any, **kwargs: Any) -> None:
+        self.content = content
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return b""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.status_code < 200 or self.status_code in NO_BODY_STATUS_CODES:
+            await super().__call__(scope, receive, send)
+            return
+
+        if self.status_code < 300:
+            content = {
+                "code": self.status_code,
+                "method": scope["method"],
+                "path": scope["path"],
+                "timestamp": _current_timestamp(),
+                "details": {"message": SUCCESS_MESSAGE, "data": self.content},
+            }
+        else:
+            content = self.content
+
+        self.body = orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+        if "content-length" in self.headers:
+            self.headers["content-length"] = str(len(self.body))
+
+        await super().__call__(scope, receive, send)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self,
+        content: Any,
+        *args: Any,
+        body_read: Optional[asyncio.Event] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(content, *args, **kwargs)
+        self.body_read = body_read
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # The content reads the request body while the response is sent, and
+        # Starlette's disconnect listener would consume those body messages. The
+        # listener only starts once body_read is set, and a disconnect cancels the
+        # stream so the content stops the work it still has pending.
+        stream = asyncio.ensure_future(self.stream_response(send))
+        listener = asyncio.ensure_future(self._cancel_on_disconnect(receive, stream))
+        try:
+            await stream
+        except OSError:
+            raise ClientDisconnect()
+        except asyncio.CancelledError:
+            if not listener.done() or listener.cancelled():
+                raise
+            return
+        finally:
+            listener.cancel()
+
+        if self.background is not None:
+            await self.background()
+
+    async def _cancel_on_disconnect(
+        self, receive: Receive, stream: asyncio.Future
+    ) -> None:
+        if self.body_read is not None:
+            await self.body_read.wait()
+        await self.listen_for_disconnect(receive)
+        stream.cancel()
+
+
+def copy_headers(source: Response, target: Response) -> None:
+    target.raw_headers.extend(
+        (name, value) for name, value in source.raw_headers if name != b"content-length"
+    )
+
+
+DEFAULT_RESPONSE_CLASS = (
+    ORJSONResponse
+    if settings.RESPONSE_FORMATTING_MIDDLEWARE
+    else StandardORJSONResponse
+)
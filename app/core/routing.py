@@ -0,0 +1,89 @@
+import inspect
+from collections.abc import Callable, Coroutine
+from functools import wraps
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app.core.deadline import with_deadline
+from app.core.responses import DEFAULT_RESPONSE_CLASS, copy_headers
+from app.core.settings import settings
+
+TRUSTED_OUTPUT = settings.API_TRUSTED_OUTPUT and not settings.ENVIRONMENT_DEBUG
+
+TRUSTED_RESPONSE_PARAMETER = "trusted_output_response"
+
+
+class DeadlineAPIRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        return with_deadline(super().get_route_handler(), self.path)
+
+
+class TrustedAPIRoute(DeadlineAPIRoute):
+    # FastAPI sends a Response returned by the endpoint as is, so wrapping the endpoint
+    # skips response_model validation through public API only. The response_model is
+    # still passed on for the OpenAPI document.
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if TRUSTED_OUTPUT and inspect.iscoroutinefunction(endpoint):
+            if isinstance(
+                kwargs.get("response_model", DefaultPlaceholder(None)),
+                DefaultPlaceholder,
+            ):
+                return_annotation = inspect.signature(
+                    endpoint, eval_str=True
+                ).return_annotation
+                if return_annotation is not inspect.Signature.empty and not (
+                    inspect.isclass(return_annotation)
+                    and issubclass(return_annotation, Response)
+                ):
+                    kwargs["response_model"] = return_annotation
+            endpoint = self._trusted_endpoint(endpoint)
+
+        super().__init__(path, endpoint, **kwargs)
+
+    def _trusted_endpoint(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            response: Response = kwargs.pop(TRUSTED_RESPONSE_PARAMETER)
+            content = await endpoint(*args, **kwargs)
+            if not isinstance(content, BaseModel):
+                return content
+
+            # Depending on the FastAPI version, the app's default_response_class is
+            # copied onto included routes or resolved per request, so a route without
+            # its own response_class uses the same default as the app.
+            response_class = self.response_class
+            if isinstance(response_class, DefaultPlaceholder):
+                response_class = DEFAULT_RESPONSE_CLASS
+
+            trusted = response_class(
+                content=content.model_dump(
+                    mode="json",
+                    include=self.response_model_include,
+                    exclude=self.response_model_exclude,
+                    by_alias=self.response_model_by_alias,
+                    exclude_unset=self.response_model_exclude_unset,
+                    exclude_defaults=self.response_model_exclude_defaults,
+                    exclude_none=self.response_model_exclude_none,
+                ),
+                status_code=response.status_code or self.status_code or 200,
+            )
+            copy_headers(response, trusted)
+            return trusted
+
+        signature = inspect.signature(endpoint, eval_str=True)
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    TRUSTED_RESPONSE_PARAMETER,
+                    inspect.Parameter.KEYWORD_ONLY,
+                    annotation=Response,
+                ),
+            ],
+            return_annotation=inspect.Signature.empty,
+        )
+        return wrapper
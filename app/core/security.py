@@ -1,7 +1,7 @@
-import secrets
-from fastapi import HTTPException, status, Security
+from fastapi import HTTPException, Request, status, Security
 from fastapi.security import APIKeyHeader
 
+from app.core.api_keys import api_key_store
 from app.core.settings import settings
 
 # API Key Authentication
@@ -15,6 +15,7 @@ api_key_header = APIKeyHeader(
 
 
 async def api_key_auth(
+    request: Request,
     api_key: str = Security(api_key_header),
 ) -> str:
     if api_key is None:
@@ -24,11 +25,13 @@ async def api_key_auth(
             headers={"WWW-Authenticate": "ApiKeyAuth"},
         )
 
-    if not secrets.compare_digest(api_key, settings.SECURITY_DEFAULT_API_KEY):
+    key = api_key_store.verify(api_key)
+    if key is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key.",
             headers={"WWW-Authenticate": "ApiKeyAuth"},
         )
 
+    request.state.api_key = key
     return api_key
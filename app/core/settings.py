@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -24,6 +26,58 @@ class Settings(BaseSettings):
     ENVIRONMENT: str
     ENVIRONMENT_DEBUG: bool = False
 
+    # RESPONSE
+    RESPONSE_FORMATTING_MIDDLEWARE: bool = False
+
+    # API
+    API_BATCH_MAX_SIZE: int = 100
+    API_BATCH_MAX_BODY_SIZE: int = 256 * 1024
+    API_STREAM_MAX_LINE_SIZE: int = 64 * 1024
+    API_STREAM_CONCURRENCY: int = 32
+    API_TRUSTED_OUTPUT: bool = False
+    API_REQUEST_TIMEOUT: float = 30.0
+    API_REQUEST_TIMEOUT_PREFIXES: Dict[str, float] = {}
+    API_REQUEST_TIMEOUT_HEADER: str = "X-Request-Timeout"
+
+    # MODULES
+    MODULES_ENABLED: List[str] = []
+
+    # OPENAPI
+    OPENAPI_PREBUILT_PATH: str = ""
+
+    # SERVER
+    SERVER_IMPLEMENTATION: str = "uvicorn"
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_REUSE_PORT: bool = True
+    SERVER_PROXY_HEADERS: bool = True
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    SERVER_GRACEFUL_TIMEOUT: float = 30.0
+    SERVER_PRELOAD: bool = True
+    SERVER_GC_FREEZE: bool = True
+    SERVER_GC_THRESHOLD: List[int] = []
+
+    # CONCURRENCY
+    CONCURRENCY_LIMIT: int = 0
+    CONCURRENCY_PREFIX_LIMITS: Dict[str, int] = {}
+    CONCURRENCY_MAX_QUEUE: int = 100
+    CONCURRENCY_QUEUE_TIMEOUT: float = 1.0
+    CONCURRENCY_RETRY_AFTER: int = 1
+    CONCURRENCY_EXEMPT_PATHS: List[str] = ["/healthz", "/metrics"]
+    CONCURRENCY_ADAPTIVE: bool = False
+    CONCURRENCY_ADAPTIVE_MIN_LIMIT: int = 1
+    CONCURRENCY_ADAPTIVE_TARGET_LATENCY: float = 0.5
+    CONCURRENCY_ADAPTIVE_BACKOFF: float = 0.9
+
+    # STARTUP
+    STARTUP_IMPORT_BUDGET: float = 1.0
+
     # SECURITY
     SECURITY_API_KEY_HEADER: str
     SECURITY_API_KEY_HEADER_DESCRIPTION: str
@@ -31,6 +85,42 @@ class Settings(BaseSettings):
     SECURITY_DEFAULT_API_KEY: str
     SECURITY_DEFAULT_API_KEY_NAME: str
     SECURITY_DEFAULT_API_KEY_DESCRIPTION: str
+    SECURITY_API_KEYS_PATH: str = ""
+    SECURITY_API_KEYS_TABLE: str = ""
+    SECURITY_API_KEYS_HMAC_SECRET: str = ""
+    SECURITY_API_KEYS_RELOAD_INTERVAL: float = 5.0
+    SECURITY_API_KEYS_CACHE_SIZE: int = 1024
+
+    # RATE LIMIT
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_ALGORITHM: str = "token_bucket"
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_NAMESPACE: str = "rate_limit"
+    RATE_LIMIT_DEFAULT_LIMIT: int = 600
+    RATE_LIMIT_WINDOW: float = 60.0
+    RATE_LIMIT_ROUTE_LIMITS: Dict[str, int] = {}
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS: int = 100000
+
+    # DATABASE
+    DATABASE_URL: str = ""
+    DATABASE_POOL_MIN_SIZE: int = 1
+    DATABASE_POOL_MAX_SIZE: int = 10
+    DATABASE_POOL_ACQUIRE_TIMEOUT: float = 5.0
+    DATABASE_STATEMENT_CACHE_SIZE: int = 128
+    DATABASE_BATCH_MAX_SIZE: int = 100
+    DATABASE_BATCH_MAX_DELAY: float = 0.005
+
+    # CACHE
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_NAMESPACE: str = "cache"
+    CACHE_MAX_SIZE: int = 10000
+    CACHE_DEFAULT_TTL: float = 60.0
+    CACHE_NEGATIVE_TTL: float = 5.0
+    CACHE_STALE_TTL: float = 30.0
 
     # LOGS
     LOGS_NAME: str
@@ -38,6 +128,23 @@ class Settings(BaseSettings):
     LOGS_LEVEL: str
     LOGS_REQUEST_ID_LENGTH: int
     LOGS_PYGMENTS_STYLE: str = "monokai"
+    LOGS_QUEUE_SIZE: int = 10000
+    LOGS_QUEUE_BATCH_SIZE: int = 256
+    LOGS_QUEUE_OVERFLOW: str = "drop_debug_first"
+    LOGS_QUEUE_BLOCK_TIMEOUT: float = 0.05
+    LOGS_SINK: str = "stderr"
+    LOGS_FILE_BUFFER_SIZE: int = 1024 * 1024
+    LOGS_ROTATION_SIZE: int = 100 * 1024 * 1024
+    LOGS_ROTATION_INTERVAL: int = 0
+    LOGS_COMPRESSION: str = "gzip"
+    LOGS_RETENTION_COUNT: int = 10
+    LOGS_RETENTION_DAYS: int = 0
+    LOGS_ACCESS_SAMPLE_RATE: float = 1.0
+    LOGS_ACCESS_SLOW_THRESHOLD: float = 1.0
+    LOGS_ACCESS_PATH_SAMPLE_RATES: Dict[str, float] = {}
+    LOGS_EXCEPTION_FULL_LIMIT: int = 5
+    LOGS_EXCEPTION_WINDOW: float = 60.0
+    LOGS_EXCEPTION_MAX_FINGERPRINTS: int = 1024
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
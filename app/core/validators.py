@@ -0,0 +1,61 @@
+import re
+from typing import Annotated
+
+from pydantic import AfterValidator, StringConstraints
+
+NAME_PATTERN = r"^[A-Za-zÀ-ÖØ-öø-ÿ\s'-]+$"
+NAME_REGEX = re.compile(NAME_PATTERN)
+NAME_ERROR_MESSAGE = "Name must contain only letters, spaces, apostrophes, and hyphens."
+IDENTIFIER_PATTERN = r"^[A-Za-z_][A-Za-z0-9_]*$"
+SLUG_PATTERN = r"^[a-z0-9]+(?:-[a-z0-9]+)*$"
+
+NAME_MIN_LENGTH = 3
+IDENTIFIER_MAX_LENGTH = 64
+SLUG_MAX_LENGTH = 128
+
+
+def validate_name(value: str) -> str:
+    if NAME_REGEX.match(value) is None:
+        raise ValueError(NAME_ERROR_MESSAGE)
+    return value
+
+
+Name = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        min_length=NAME_MIN_LENGTH,
+    ),
+    AfterValidator(validate_name),
+]
+
+LowercaseName = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        to_lower=True,
+        min_length=NAME_MIN_LENGTH,
+    ),
+    AfterValidator(validate_name),
+]
+
+Identifier = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        min_length=1,
+        max_length=IDENTIFIER_MAX_LENGTH,
+        pattern=IDENTIFIER_PATTERN,
+    ),
+]
+
+Slug = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        to_lower=True,
+        min_length=1,
+        max_length=SLUG_MAX_LENGTH,
+        pattern=SLUG_PATTERN,
+    ),
+]
@@ -1 +1,8 @@
+from abc import ABC, abstractmethod
 
+from app.modules.example.domain.entities import Example
+
+
+class ExampleRepositoryInterface(ABC):
+    @abstractmethod
+    async def save(self, example: Example) -> None: ...
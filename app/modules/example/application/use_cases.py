@@ -1,26 +1,33 @@
+import asyncio
+from typing import List, Union
+
 from loguru import logger
 
+from app.core.cache import cached, create_cache
+from app.core.deadline import check_deadline
 from app.core.exceptions import StandardException
 
+from app.modules.example.application.interfaces import ExampleRepositoryInterface
+from app.modules.example.application.utils import single_flight
 from app.modules.example.domain.entities import Example
 from app.modules.example.presentation.exceptions import (
     ExampleNameNotProvidedException,
     ExampleUseCasesException,
 )
 
+hello_cache = create_cache("example.hello")
+
 
 class ExampleUseCases:
+    def __init__(self, repository: ExampleRepositoryInterface, client_id: str) -> None:
+        self.repository = repository
+        self.client_id = client_id
+
     async def hello(self, example: Example) -> Example:
         try:
-            if not example.name:
-                logger.info("Example name not provided, raising exception.")
-
-                raise ExampleNameNotProvidedException(
-                    message="Example name must be provided.",
-                    errors="The 'name' field is required for processing the example.",
-                )
-
-            example.message = f"Hello {example.name}!"
+            example.message = await self._greeting(example.name)
+            check_deadline()
+            await self.repository.save(example)
             return example
 
         except StandardException:
@@ -28,3 +35,30 @@ class ExampleUseCases:
         except Exception as e:
             logger.opt(exception=e).error("fAn error occurred in the hello use case.")
             raise ExampleUseCasesException()
+
+    # Only the greeting is cached and coalesced, every call still saves its own row.
+    @cached(hello_cache, key=lambda self, name: name)
+    @single_flight("example.hello", key=lambda self, name: (self.client_id, name))
+    async def _greeting(self, name: str) -> str:
+        if not name:
+            logger.info("Example name not provided, raising exception.")
+
+            raise ExampleNameNotProvidedException(
+                message="Example name must be provided.",
+                errors="The 'name' field is required for processing the example.",
+            )
+
+        return f"Hello {name}!"
+
+    async def hello_many(
+        self, examples: List[Example]
+    ) -> List[Union[Example, StandardException]]:
+        results = await asyncio.gather(
+            *(self.hello(example) for example in examples), return_exceptions=True
+        )
+        return [
+            result
+            if isinstance(result, (Example, StandardException))
+            else ExampleUseCasesException()
+            for result in results
+        ]
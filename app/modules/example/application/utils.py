@@ -0,0 +1,56 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from functools import wraps
+from typing import Any, Dict
+
+from app.core.metrics import metrics
+
+
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._calls = 0
+        self._executions = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._calls += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            self._executions += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        collapsed = self._calls - self._executions
+        return {
+            "calls": self._calls,
+            "executions": self._executions,
+            "collapsed": collapsed,
+            "collapse_ratio": collapsed / self._calls if self._calls else 0.0,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            future.exception()
+
+
+def single_flight(name: str, key: Callable[..., Hashable]):
+    group = SingleFlight(name)
+    metrics.register_collector(f"single_flight.{name}", group.stats)
+
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            return await group.do(key(*args, **kwargs), lambda: method(*args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
@@ -1,5 +1,16 @@
+from time import time
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.exceptions import StandardException
+
 from app.modules.example.domain.entities import Example
-from app.modules.example.presentation.schemas import ExampleRequest, ExampleResponse
+from app.modules.example.infrastructure.models import ExampleGreetingModel
+from app.modules.example.presentation.schemas import (
+    ExampleBatchItemResponse,
+    ExampleBatchResponse,
+    ExampleRequest,
+    ExampleResponse,
+)
 
 
 def example_request_to_domain(
@@ -19,3 +30,64 @@ def domain_to_example_response(
     return ExampleResponse(
         message=entity.message,
     )
+
+
+def domain_to_example_model(
+    entity: Example,
+) -> ExampleGreetingModel:
+    if entity.message is None:
+        raise ValueError("Entity message must be set, all fields must be filled.")
+
+    return ExampleGreetingModel(
+        name=entity.name,
+        message=entity.message,
+        created_at=time(),
+    )
+
+
+def example_result_to_batch_item(
+    index: int,
+    outcome: Union[Example, StandardException],
+) -> ExampleBatchItemResponse:
+    if isinstance(outcome, StandardException):
+        return ExampleBatchItemResponse(
+            index=index,
+            code=outcome.status_code,
+            error={"message": outcome.message, "data": outcome.data},
+        )
+
+    return ExampleBatchItemResponse(
+        index=index,
+        code=200,
+        result=domain_to_example_response(outcome),
+    )
+
+
+def example_validation_errors_to_batch_item(
+    index: int,
+    errors: Dict[str, Any],
+) -> ExampleBatchItemResponse:
+    return ExampleBatchItemResponse(
+        index=index,
+        code=422,
+        error={"message": "Form validation error", "data": errors},
+    )
+
+
+def example_results_to_batch_response(
+    requests: List[Optional[ExampleRequest]],
+    errors: Dict[int, Dict[str, Any]],
+    results: List[Union[Example, StandardException]],
+) -> ExampleBatchResponse:
+    items = []
+    outcomes = iter(results)
+    for index, request in enumerate(requests):
+        if request is None:
+            items.append(example_validation_errors_to_batch_item(index, errors[index]))
+        else:
+            items.append(example_result_to_batch_item(index, next(outcomes)))
+
+    failed = sum(1 for item in items if item.error is not None)
+    return ExampleBatchResponse(
+        items=items, succeeded=len(items) - failed, failed=failed
+    )
@@ -0,0 +1,25 @@
+from dataclasses import astuple, dataclass
+
+EXAMPLE_GREETINGS_TABLE = "example_greetings"
+
+EXAMPLE_GREETINGS_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {EXAMPLE_GREETINGS_TABLE} (
+    name VARCHAR(255) NOT NULL,
+    message VARCHAR(255) NOT NULL,
+    created_at DOUBLE PRECISION NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class ExampleGreetingModel:
+    name: str
+    message: str
+    created_at: float
+
+    @classmethod
+    def columns(cls) -> tuple[str, ...]:
+        return cls.__slots__
+
+    def as_row(self) -> tuple:
+        return astuple(self)
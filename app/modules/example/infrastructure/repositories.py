@@ -0,0 +1,32 @@
+from app.core.database import BatchWriter, database_enabled
+from app.core.settings import settings
+from app.modules.example.application.interfaces import ExampleRepositoryInterface
+from app.modules.example.domain.entities import Example
+from app.modules.example.domain.mappers import domain_to_example_model
+from app.modules.example.infrastructure.models import (
+    EXAMPLE_GREETINGS_SCHEMA,
+    EXAMPLE_GREETINGS_TABLE,
+    ExampleGreetingModel,
+)
+
+
+class ExampleRepository(ExampleRepositoryInterface):
+    def __init__(self) -> None:
+        self.writer = (
+            BatchWriter(
+                table=EXAMPLE_GREETINGS_TABLE,
+                columns=ExampleGreetingModel.columns(),
+                max_batch_size=settings.DATABASE_BATCH_MAX_SIZE,
+                max_delay=settings.DATABASE_BATCH_MAX_DELAY,
+                schema=EXAMPLE_GREETINGS_SCHEMA,
+            )
+            if database_enabled()
+            else None
+        )
+
+    async def save(self, example: Example) -> None:
+        if self.writer is None:
+            return
+
+        model = domain_to_example_model(example)
+        await self.writer.write(model.as_row())
@@ -1,5 +1,19 @@
+from fastapi import Depends, Security
+
+from app.core.security import api_key_auth
+from app.modules.example.application.interfaces import ExampleRepositoryInterface
 from app.modules.example.application.use_cases import ExampleUseCases
+from app.modules.example.infrastructure.repositories import ExampleRepository
+
+example_repository = ExampleRepository()
+
+
+def get_example_repository() -> ExampleRepositoryInterface:
+    return example_repository
 
 
-def get_example_use_cases() -> ExampleUseCases:
-    return ExampleUseCases()
+def get_example_use_cases(
+    repository: ExampleRepositoryInterface = Depends(get_example_repository),
+    api_key: str = Security(api_key_auth),
+) -> ExampleUseCases:
+    return ExampleUseCases(repository, client_id=api_key)
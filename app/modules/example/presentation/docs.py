@@ -2,15 +2,20 @@ from http import HTTPStatus
 
 from fastapi import Security
 
+from app.core.responses import NDJSONStreamingResponse
 from app.core.schemas import StandardResponse
-from app.core.security import api_key_auth
-from app.modules.example.presentation.schemas import ExampleResponse
+from app.core.rate_limit import rate_limit
+from app.core.settings import settings
+from app.modules.example.presentation.schemas import (
+    ExampleBatchResponse,
+    ExampleResponse,
+)
 
 
 example_docs = {
     "prefix": "/api/v1/example",
     "tags": ["example"],
-    "dependencies": [Security(api_key_auth)],
+    "dependencies": [Security(rate_limit)],
     "responses": {
         401: {
             "model": StandardResponse,
@@ -48,6 +53,28 @@ example_docs = {
                 }
             },
         },
+        429: {
+            "model": StandardResponse,
+            "description": "Too many requests",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 429,
+                        "method": "POST",
+                        "path": "/api/v1/example",
+                        "timestamp": "2025-07-15T12:34:56Z",
+                        "details": {
+                            "message": "Too many requests",
+                            "data": {
+                                "errors": [
+                                    "The rate limit for this API key was exceeded, please retry later."
+                                ]
+                            },
+                        },
+                    }
+                }
+            },
+        },
         500: {
             "model": StandardResponse,
             "description": "Internal Server Error",
@@ -97,3 +124,123 @@ example_request_docs = {
         }
     },
 }
+
+example_batch_request_docs = {
+    "summary": "Endpoint Example (Batch)",
+    "description": "This endpoint returns a greeting message for each item of a list, "
+    f"with per-item results and errors. At most {settings.API_BATCH_MAX_SIZE} items "
+    f"and {settings.API_BATCH_MAX_BODY_SIZE} bytes are accepted per request.",
+    "response_description": "Returns one greeting or error per item.",
+    "status_code": HTTPStatus.OK,
+    "openapi_extra": {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/ExampleRequest"},
+                        "maxItems": settings.API_BATCH_MAX_SIZE,
+                    },
+                    "example": [{"name": "Bruno Tanabe"}, {"name": "João da Silva"}],
+                }
+            },
+        }
+    },
+    "responses": {
+        200: {
+            "description": "Successful response",
+            "model": StandardResponse[ExampleBatchResponse],
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "method": "POST",
+                        "path": "/api/v1/example/batch",
+                        "timestamp": "2025-01-15T10:30:00Z",
+                        "details": {
+                            "message": "Request processed successfully.",
+                            "data": {
+                                "items": [
+                                    {
+                                        "index": 0,
+                                        "code": 200,
+                                        "result": {"message": "Hello Bruno Tanabe!"},
+                                    },
+                                    {
+                                        "index": 1,
+                                        "code": 422,
+                                        "error": {
+                                            "message": "Form validation error",
+                                            "data": {
+                                                "name": "String should have at least 3 characters"
+                                            },
+                                        },
+                                    },
+                                ],
+                                "succeeded": 1,
+                                "failed": 1,
+                            },
+                        },
+                    }
+                }
+            },
+        },
+        413: {
+            "model": StandardResponse,
+            "description": "Batch too large",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 413,
+                        "method": "POST",
+                        "path": "/api/v1/example/batch",
+                        "timestamp": "2025-01-15T10:30:00Z",
+                        "details": {
+                            "message": "Batch too large",
+                            "data": {
+                                "errors": [
+                                    "The batch exceeds the maximum number of items per request."
+                                ]
+                            },
+                        },
+                    }
+                }
+            },
+        },
+    },
+}
+
+example_stream_request_docs = {
+    "summary": "Endpoint Example (NDJSON stream)",
+    "description": "This endpoint reads one example request per line of an "
+    "application/x-ndjson body and writes one result per line as soon as it "
+    "completes, so neither the request nor the response is held in memory. "
+    "Results may arrive out of order, use the index field to match them.",
+    "response_description": "Returns one greeting or error per line.",
+    "status_code": HTTPStatus.OK,
+    "response_class": NDJSONStreamingResponse,
+    "openapi_extra": {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/ExampleRequest"},
+                    "example": '{"name": "Bruno Tanabe"}\n{"name": "João da Silva"}\n',
+                }
+            },
+        }
+    },
+    "responses": {
+        200: {
+            "description": "Successful response",
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/ExampleBatchItemResponse"},
+                    "example": '{"index":1,"code":200,"result":{"message":"hello joão da silva!"},"error":null}\n'
+                    '{"index":0,"code":200,"result":{"message":"hello bruno tanabe!"},"error":null}\n',
+                }
+            },
+        },
+    },
+}
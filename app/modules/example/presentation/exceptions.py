@@ -53,3 +53,54 @@ class ExampleNameNotProvidedException(StandardException):
             message=message,
             data={"errors": error_list},
         )
+
+
+class ExampleBatchInvalidException(StandardException):
+    def __init__(
+        self,
+        message: str = "Form validation error",
+        errors: Union[
+            str, List[str]
+        ] = "The request body must be a JSON array of example requests.",
+    ) -> None:
+        error_list = [errors] if isinstance(errors, str) else errors
+
+        super().__init__(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            message=message,
+            data={"errors": error_list},
+        )
+
+
+class ExampleBatchTooLargeException(StandardException):
+    def __init__(
+        self,
+        message: str = "Batch too large",
+        errors: Union[
+            str, List[str]
+        ] = "The batch exceeds the maximum number of items per request.",
+    ) -> None:
+        error_list = [errors] if isinstance(errors, str) else errors
+
+        super().__init__(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            message=message,
+            data={"errors": error_list},
+        )
+
+
+class ExampleStreamLineTooLargeException(StandardException):
+    def __init__(
+        self,
+        message: str = "Line too large",
+        errors: Union[
+            str, List[str]
+        ] = "A line of the NDJSON stream exceeds the maximum line size.",
+    ) -> None:
+        error_list = [errors] if isinstance(errors, str) else errors
+
+        super().__init__(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            message=message,
+            data={"errors": error_list},
+        )
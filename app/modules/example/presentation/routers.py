@@ -1,18 +1,49 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
 from loguru import logger
+from pydantic import TypeAdapter, ValidationError
 
-from app.core.exceptions import StandardException
+from app.core.deadline import deadline_context, get_deadline, seconds_until
+from app.core.exceptions import DeadlineExceededException, StandardException
+from app.core.metrics import metrics
+from app.core.responses import NDJSONStreamingResponse, copy_headers
+from app.core.routing import TrustedAPIRoute
+from app.core.settings import settings
 from app.modules.example.application.use_cases import ExampleUseCases
 from app.modules.example.domain.mappers import (
     domain_to_example_response,
     example_request_to_domain,
+    example_result_to_batch_item,
+    example_results_to_batch_response,
+    example_validation_errors_to_batch_item,
 )
 from app.modules.example.presentation.dependencies import get_example_use_cases
-from app.modules.example.presentation.docs import example_docs, example_request_docs
-from app.modules.example.presentation.exceptions import ExampleException
-from app.modules.example.presentation.schemas import ExampleRequest, ExampleResponse
+from app.modules.example.presentation.docs import (
+    example_batch_request_docs,
+    example_docs,
+    example_request_docs,
+    example_stream_request_docs,
+)
+from app.modules.example.presentation.exceptions import (
+    ExampleBatchInvalidException,
+    ExampleBatchTooLargeException,
+    ExampleException,
+    ExampleStreamLineTooLargeException,
+)
+from app.modules.example.presentation.schemas import (
+    ExampleBatchItemResponse,
+    ExampleBatchResponse,
+    ExampleRequest,
+    ExampleResponse,
+)
 
-router = APIRouter(**example_docs)
+router = APIRouter(**example_docs, route_class=TrustedAPIRoute)
+
+example_batch_adapter = TypeAdapter(List[ExampleRequest])
 
 
 @router.post("/", **example_request_docs)
@@ -31,3 +62,221 @@ async def hello(
     except Exception as e:
         logger.opt(exception=e).error("An error occurred in the hello endpoint.")
         raise ExampleException()
+
+
+@router.post("/batch", **example_batch_request_docs)
+async def hello_batch(
+    request: Request,
+    use_case: ExampleUseCases = Depends(get_example_use_cases),
+) -> ExampleBatchResponse:
+    requests, errors = _validate_batch(await _read_batch_body(request))
+
+    try:
+        request_domains = [
+            example_request_to_domain(item) for item in requests if item is not None
+        ]
+        response_domains = await use_case.hello_many(request_domains)
+        output = example_results_to_batch_response(requests, errors, response_domains)
+
+        return output
+    except StandardException:
+        raise
+    except Exception as e:
+        logger.opt(exception=e).error("An error occurred in the hello batch endpoint.")
+        raise ExampleException()
+
+
+@router.post("/stream", **example_stream_request_docs)
+async def hello_stream(
+    request: Request,
+    response: Response,
+    use_case: ExampleUseCases = Depends(get_example_use_cases),
+) -> NDJSONStreamingResponse:
+    # FastAPI ignores the headers set by dependencies, such as the RateLimit ones,
+    # when the endpoint returns its own response.
+    body_read = asyncio.Event()
+    stream = NDJSONStreamingResponse(
+        _stream_results(request, use_case, get_deadline(), body_read),
+        body_read=body_read,
+    )
+    copy_headers(response, stream)
+    return stream
+
+
+async def _read_batch_body(request: Request) -> bytes:
+    max_body_size = settings.API_BATCH_MAX_BODY_SIZE
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_body_size:
+        raise _batch_body_too_large()
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_body_size:
+            raise _batch_body_too_large()
+    return bytes(body)
+
+
+def _batch_body_too_large() -> ExampleBatchTooLargeException:
+    return ExampleBatchTooLargeException(
+        errors=f"The request body exceeds the maximum of "
+        f"{settings.API_BATCH_MAX_BODY_SIZE} bytes."
+    )
+
+
+def _validate_batch(
+    body: bytes,
+) -> Tuple[List[Optional[ExampleRequest]], Dict[int, Dict[str, Any]]]:
+    try:
+        requests = example_batch_adapter.validate_json(body)
+    except ValidationError:
+        pass
+    else:
+        _check_batch_size(len(requests))
+        return requests, {}
+
+    try:
+        items = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise ExampleBatchInvalidException()
+    if not isinstance(items, list):
+        raise ExampleBatchInvalidException()
+    _check_batch_size(len(items))
+
+    requests, errors = [], {}
+    for index, item in enumerate(items):
+        try:
+            requests.append(ExampleRequest.model_validate(item))
+        except ValidationError as e:
+            requests.append(None)
+            errors[index] = _validation_errors(e)
+    return requests, errors
+
+
+def _validation_errors(exc: ValidationError) -> Dict[str, Any]:
+    return {
+        str(error["loc"][-1]) if error["loc"] else "item": error["msg"]
+        for error in exc.errors()
+    }
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.API_BATCH_MAX_SIZE:
+        raise ExampleBatchTooLargeException(
+            errors=f"The batch has {size} items, the maximum is "
+            f"{settings.API_BATCH_MAX_SIZE}."
+        )
+
+
+async def _stream_results(
+    request: Request,
+    use_case: ExampleUseCases,
+    deadline: Optional[float],
+    body_read: asyncio.Event,
+) -> AsyncIterator[bytes]:
+    # The body is streamed after the route handler, and its deadline scope, returned.
+    # The stream enforces the request deadline itself and runs every item with it.
+    context = deadline_context(deadline)
+    lines = _iter_ndjson_lines(request)
+    pending: set[asyncio.Task] = set()
+    index = 0
+    error: Optional[StandardException] = None
+    expired = False
+    try:
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(anext(lines), seconds_until(deadline))
+                except StopAsyncIteration:
+                    body_read.set()
+                    break
+
+                if len(pending) >= settings.API_STREAM_CONCURRENCY:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=seconds_until(deadline),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not done:
+                        raise TimeoutError()
+                    for task in done:
+                        yield task.result()
+
+                pending.add(
+                    asyncio.create_task(
+                        _process_line(use_case, index, line), context=context.copy()
+                    )
+                )
+                index += 1
+        except TimeoutError:
+            expired = True
+        except StandardException as e:
+            error = e
+
+        while pending and not expired:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=seconds_until(deadline),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            expired = not done
+            for task in done:
+                yield task.result()
+
+        if expired:
+            done = {task for task in pending if task.done()}
+            pending -= done
+            for task in done:
+                yield task.result()
+
+            metrics.increment("deadline.exceeded")
+            error = DeadlineExceededException()
+        if error is not None:
+            yield _ndjson_line(example_result_to_batch_item(index, error))
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    max_line_size = settings.API_STREAM_MAX_LINE_SIZE
+    buffer = bytearray()
+    async for chunk in request.stream():
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if end - start > max_line_size:
+                raise ExampleStreamLineTooLargeException()
+            line = bytes(buffer[start:end])
+            start = end + 1
+            if line.strip():
+                yield line
+        del buffer[:start]
+
+        if len(buffer) > max_line_size:
+            raise ExampleStreamLineTooLargeException()
+
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+async def _process_line(use_case: ExampleUseCases, index: int, line: bytes) -> bytes:
+    try:
+        payload = ExampleRequest.model_validate_json(line)
+    except ValidationError as e:
+        return _ndjson_line(
+            example_validation_errors_to_batch_item(index, _validation_errors(e))
+        )
+
+    try:
+        outcome = await use_case.hello(example_request_to_domain(payload))
+        return _ndjson_line(example_result_to_batch_item(index, outcome))
+    except StandardException as e:
+        return _ndjson_line(example_result_to_batch_item(index, e))
+    except Exception as e:
+        logger.opt(exception=e).error("An error occurred in the hello stream endpoint.")
+        return _ndjson_line(example_result_to_batch_item(index, ExampleException()))
+
+
+def _ndjson_line(item: ExampleBatchItemResponse) -> bytes:
+    return item.model_dump_json().encode() + b"\n"
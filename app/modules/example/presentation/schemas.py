@@ -1,13 +1,24 @@
-import re
+from typing import Annotated, Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+from app.core.validators import NAME_MIN_LENGTH, LowercaseName
+
+Greeting = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        to_lower=True,
+        min_length=NAME_MIN_LENGTH,
+        pattern=r"^Hello\s[A-Za-zÀ-ÖØ-öø-ÿ\s'-]+!$",
+    ),
+]
 
 
 class ExampleRequest(BaseModel):
-    name: str = Field(
+    name: LowercaseName = Field(
         title="Individual's name (Required)",
         description="Name to receive 'Hello' in the response. Must be a valid name.",
-        min_length=3,
         examples=["Bruno Tanabe", "João da Silva"],
         json_schema_extra={
             "example": "Bruno Tanabe",
@@ -15,19 +26,8 @@ class ExampleRequest(BaseModel):
         },
     )
 
-    @field_validator("name")
-    def validate_name(cls, request: str) -> str:
-        if not re.match(r"^[A-Za-zÀ-ÖØ-öø-ÿ\s'-]+$", request):
-            raise ValueError(
-                "Name must contain only letters, spaces, apostrophes, and hyphens."
-            )
-        return request.strip()
-
     model_config = ConfigDict(
         title="ExampleRequest",
-        str_strip_whitespace=True,
-        str_to_lower=True,
-        str_min_length=3,
         extra="forbid",
         validate_default=True,
         validate_assignment=True,
@@ -53,11 +53,9 @@ class ExampleRequest(BaseModel):
 
 
 class ExampleResponse(BaseModel):
-    message: str = Field(
+    message: Greeting = Field(
         title="Response message (Required)",
         description="Message to be returned in the response, greeting the individual.",
-        min_length=3,
-        pattern=r"^Hello\s[A-Za-zÀ-ÖØ-öø-ÿ\s'-]+!$",
         examples=["Hello Bruno Tanabe!", "Hello João da Silva!"],
         json_schema_extra={
             "example": "Hello Bruno Tanabe!",
@@ -67,9 +65,6 @@ class ExampleResponse(BaseModel):
 
     model_config = ConfigDict(
         title="ExampleResponse",
-        str_strip_whitespace=True,
-        str_to_lower=True,
-        str_min_length=3,
         extra="forbid",
         validate_default=True,
         validate_assignment=True,
@@ -92,3 +87,82 @@ class ExampleResponse(BaseModel):
             ],
         },
     )
+
+
+class ExampleBatchItemResponse(BaseModel):
+    index: int = Field(
+        title="Item index (Required)",
+        description="Position of the item in the request list.",
+        ge=0,
+        examples=[0, 1],
+    )
+    code: int = Field(
+        title="Item status code (Required)",
+        description="HTTP status code the item would have received on the single-item endpoint.",
+        ge=100,
+        le=599,
+        examples=[200, 422],
+    )
+    result: Optional[ExampleResponse] = Field(
+        default=None,
+        title="Item result (Optional)",
+        description="Greeting for the item, present when the item succeeded.",
+    )
+    error: Optional[Dict[str, Any]] = Field(
+        default=None,
+        title="Item error (Optional)",
+        description="Error message and data for the item, present when the item failed.",
+        examples=[
+            {
+                "message": "Form validation error",
+                "data": {"name": "String should have at least 3 characters"},
+            }
+        ],
+    )
+
+    model_config = ConfigDict(
+        title="ExampleBatchItemResponse",
+        extra="forbid",
+    )
+
+
+class ExampleBatchResponse(BaseModel):
+    items: List[ExampleBatchItemResponse] = Field(
+        title="Item results (Required)",
+        description="One entry per request item, in request order.",
+    )
+    succeeded: int = Field(
+        title="Succeeded items (Required)",
+        description="Number of items processed successfully.",
+        ge=0,
+    )
+    failed: int = Field(
+        title="Failed items (Required)",
+        description="Number of items that failed validation or processing.",
+        ge=0,
+    )
+
+    model_config = ConfigDict(
+        title="ExampleBatchResponse",
+        extra="forbid",
+        json_schema_extra={
+            "description": "Example schema for the response of a batch of greetings.",
+            "example": {
+                "items": [
+                    {"index": 0, "code": 200, "result": {"message": "Hello Bruno!"}},
+                    {
+                        "index": 1,
+                        "code": 422,
+                        "error": {
+                            "message": "Form validation error",
+                            "data": {
+                                "name": "String should have at least 3 characters"
+                            },
+                        },
+                    },
+                ],
+                "succeeded": 1,
+                "failed": 1,
+            },
+        },
+    )
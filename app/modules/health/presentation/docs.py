@@ -1,8 +1,13 @@
 from http import HTTPStatus
+from fastapi import Security
 from fastapi.responses import RedirectResponse
 
 from app.core.schemas import StandardResponse
-from app.modules.health.presentation.schemas import HealthCheckResponse
+from app.core.security import api_key_auth
+from app.modules.health.presentation.schemas import (
+    HealthCheckResponse,
+    MetricsResponse,
+)
 
 router_docs = {
     "prefix": "",
@@ -96,6 +101,45 @@ health_check_docs = {
     },
 }
 
+metrics_docs = {
+    "summary": "Endpoint for inspecting the application metrics",
+    "description": "This endpoint returns a snapshot of the in-process counters, such as access log sampling decisions and log queue statistics.",
+    "response_description": "Returns the current metrics snapshot.",
+    "status_code": HTTPStatus.OK,
+    "include_in_schema": False,
+    "dependencies": [Security(api_key_auth)],
+    "responses": {
+        200: {
+            "description": "Successful metrics snapshot",
+            "model": StandardResponse[MetricsResponse],
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "Metrics Snapshot": {
+                            "summary": "Current metrics snapshot",
+                            "code": 200,
+                            "method": "GET",
+                            "path": "/metrics",
+                            "timestamp": "2025-01-15T10:30:00Z",
+                            "details": {
+                                "message": "Request processed successfully",
+                                "data": {
+                                    "metrics": {
+                                        "counters": {
+                                            "access_log.sampled": 10,
+                                            "access_log.dropped": 90,
+                                        },
+                                    }
+                                },
+                            },
+                        },
+                    }
+                }
+            },
+        }
+    },
+}
+
 redirect_root_docs = {
     "summary": "Redirects root path to FastAPI documentation",
     "description": "This endpoint redirects the root path to the FastAPI documentation page.",
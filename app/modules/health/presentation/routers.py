@@ -3,14 +3,19 @@ from loguru import logger
 from fastapi.responses import RedirectResponse
 
 from app.core.exceptions import StandardException
+from app.core.metrics import metrics
 from app.modules.health.application.enums import HealthType
 from app.modules.health.presentation.docs import (
     router_docs,
     health_check_docs,
+    metrics_docs,
     redirect_root_docs,
 )
 from app.modules.health.presentation.exceptions import HealthCheckStandardException
-from app.modules.health.presentation.schemas import HealthCheckResponse
+from app.modules.health.presentation.schemas import (
+    HealthCheckResponse,
+    MetricsResponse,
+)
 
 router = APIRouter(**router_docs)
 
@@ -30,6 +35,21 @@ async def health_check() -> HealthCheckResponse:
         raise HealthCheckStandardException()
 
 
+@router.get("/metrics", **metrics_docs)
+async def metrics_snapshot() -> MetricsResponse:
+    try:
+        output = MetricsResponse(
+            metrics=metrics.snapshot(),
+        )
+
+        return output
+    except StandardException:
+        raise
+    except Exception as e:
+        logger.opt(exception=e).error("An error occurred in the metrics endpoint.")
+        raise HealthCheckStandardException()
+
+
 @router.get("/", **redirect_root_docs)
 async def redirect_root() -> RedirectResponse:
     try:
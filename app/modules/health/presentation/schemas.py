@@ -1,3 +1,5 @@
+from typing import Any, Dict
+
 from pydantic import BaseModel, Field, ConfigDict
 
 from app.modules.health.application.enums import HealthType
@@ -37,3 +39,35 @@ class HealthCheckResponse(BaseModel):
             ],
         },
     )
+
+
+class MetricsResponse(BaseModel):
+    metrics: Dict[str, Any] = Field(
+        title="Metrics",
+        description="Snapshot of the in-process counters and subsystem statistics.",
+        examples=[{"counters": {"access_log.sampled": 10, "access_log.dropped": 90}}],
+        json_schema_extra={
+            "example": {"counters": {"access_log.sampled": 10}},
+            "readOnly": True,
+        },
+    )
+
+    model_config = ConfigDict(
+        title="MetricsResponse",
+        extra="forbid",
+        validate_default=True,
+        validate_assignment=True,
+        validate_return=True,
+        json_schema_extra={
+            "description": "Response model for the metrics endpoint.",
+            "example": {
+                "metrics": {
+                    "counters": {
+                        "access_log.sampled": 10,
+                        "access_log.dropped": 90,
+                    },
+                    "logs": {"queued": 0, "written": 120, "dropped": 0},
+                },
+            },
+        },
+    )
@@ -0,0 +1,230 @@
+import gc
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from typing import Dict, Optional
+
+from loguru import logger
+
+from app.core.process import memory_usage
+from app.core.settings import settings
+
+APPLICATION = "app.app:app"
+SERVERS = ("uvicorn", "hypercorn")
+RESTART_BACKOFF = 1.0
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def bind_socket() -> socket.socket:
+    family = socket.AF_INET6 if ":" in settings.SERVER_HOST else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if settings.SERVER_REUSE_PORT:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind((settings.SERVER_HOST, settings.SERVER_PORT))
+    sock.listen(settings.SERVER_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def configure_gc() -> None:
+    if settings.SERVER_GC_THRESHOLD:
+        gc.set_threshold(*settings.SERVER_GC_THRESHOLD)
+
+
+def preload() -> None:
+    from app.core.openapi import load_openapi_document
+
+    if settings.SERVER_GC_FREEZE:
+        gc.disable()
+
+    module, _, attribute = APPLICATION.partition(":")
+    app = getattr(importlib.import_module(module), attribute)
+    load_openapi_document(app)
+
+    # No collection before freezing: it would free holes in the master's pages that
+    # the workers then fill, copying the shared pages on write.
+    if settings.SERVER_GC_FREEZE:
+        gc.freeze()
+
+    logger.info(
+        "Application preloaded in the master process",
+        frozen_objects=gc.get_freeze_count(),
+        **memory_usage(),
+    )
+
+
+def run_worker(sock: socket.socket) -> None:
+    os.setpgrp()
+    configure_gc()
+    gc.enable()
+    if settings.SERVER_IMPLEMENTATION == "uvicorn":
+        _run_uvicorn(sock)
+    else:
+        _run_hypercorn(sock)
+
+
+def _max_requests() -> Optional[int]:
+    if settings.SERVER_MAX_REQUESTS <= 0:
+        return None
+    return settings.SERVER_MAX_REQUESTS + random.randint(
+        0, settings.SERVER_MAX_REQUESTS_JITTER
+    )
+
+
+def _run_uvicorn(sock: socket.socket) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(
+        APPLICATION,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=int(settings.SERVER_GRACEFUL_TIMEOUT),
+        limit_max_requests=_max_requests(),
+        proxy_headers=settings.SERVER_PROXY_HEADERS,
+        access_log=False,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _run_hypercorn(sock: socket.socket) -> None:
+    from hypercorn.asyncio.run import asyncio_worker, uvloop_worker
+    from hypercorn.config import Config, Sockets
+
+    config = Config()
+    config.application_path = APPLICATION
+    config.backlog = settings.SERVER_BACKLOG
+    config.keep_alive_timeout = settings.SERVER_KEEP_ALIVE
+    config.graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+    if settings.SERVER_MAX_REQUESTS > 0:
+        config.max_requests = settings.SERVER_MAX_REQUESTS
+        config.max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+
+    sock.setblocking(False)
+    worker = uvloop_worker if _use_uvloop() else asyncio_worker
+    worker(config, sockets=Sockets([], [sock], []))
+
+
+def _use_uvloop() -> bool:
+    if settings.SERVER_LOOP != "auto":
+        return settings.SERVER_LOOP == "uvloop"
+    return importlib.util.find_spec("uvloop") is not None
+
+
+class Supervisor:
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.context = multiprocessing.get_context(
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        self.sockets: Dict[int, socket.socket] = {}
+        self.processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self.started: Dict[int, float] = {}
+        self.stopping = False
+        self.signal = signal.SIGTERM
+
+    def run(self) -> None:
+        if settings.SERVER_IMPLEMENTATION not in SERVERS:
+            raise ValueError(
+                f"Invalid server implementation: {settings.SERVER_IMPLEMENTATION}. "
+                f"Valid implementations are: {', '.join(SERVERS)}."
+            )
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        logger.info(
+            f"Starting {self.workers} {settings.SERVER_IMPLEMENTATION} workers on "
+            f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+            loop=settings.SERVER_LOOP,
+            http=settings.SERVER_HTTP,
+            reuse_port=settings.SERVER_REUSE_PORT,
+            preload=settings.SERVER_PRELOAD,
+            max_requests=settings.SERVER_MAX_REQUESTS,
+        )
+        configure_gc()
+        if settings.SERVER_PRELOAD and self.context.get_start_method() == "fork":
+            preload()
+
+        shared = None if settings.SERVER_REUSE_PORT else bind_socket()
+        for slot in range(self.workers):
+            self.sockets[slot] = shared or bind_socket()
+            self._spawn(slot)
+
+        while not self.stopping:
+            wait([process.sentinel for process in self.processes.values()], 1.0)
+            for slot, process in list(self.processes.items()):
+                if process.is_alive() or self.stopping:
+                    continue
+                self._restart(slot, process)
+
+        self._shutdown()
+
+    def _spawn(self, slot: int) -> None:
+        process = self.context.Process(
+            target=run_worker,
+            args=(self.sockets[slot],),
+            name=f"{settings.SERVER_IMPLEMENTATION}-worker-{slot}",
+        )
+        process.start()
+        self.processes[slot] = process
+        self.started[slot] = time.monotonic()
+
+    def _restart(self, slot: int, process: multiprocessing.process.BaseProcess) -> None:
+        process.join()
+        if process.exitcode == 0:
+            logger.info(f"Worker {process.pid} exited, restarting it", slot=slot)
+        else:
+            logger.warning(
+                f"Worker {process.pid} died, restarting it",
+                slot=slot,
+                exit_code=process.exitcode,
+            )
+            if time.monotonic() - self.started[slot] < RESTART_BACKOFF:
+                time.sleep(RESTART_BACKOFF)
+        self._spawn(slot)
+
+    def _stop(self, signum: int, frame) -> None:  # noqa: ARG002
+        self.stopping = True
+        self.signal = signum
+
+    def _shutdown(self) -> None:
+        logger.info("Stopping workers", workers=len(self.processes))
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, self.signal)
+
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT
+        for process in self.processes.values():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning(f"Worker {process.pid} did not stop in time, killing it")
+                process.kill()
+                process.join()
+
+        for sock in set(self.sockets.values()):
+            sock.close()
+
+
+def main() -> None:
+    Supervisor(worker_count()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+In-process per-item throughput of the example batch endpoint against the single-item endpoint.
+
+The same number of greetings is sent once as individual POST /api/v1/example/ calls and
+once as POST /api/v1/example/batch calls of --batch-size items each.
+
+Usage:
+    python -m scripts.benchmark_batch --items 10000 --batch-size 100 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import os
+from contextlib import redirect_stderr
+
+import orjson
+
+from app.app import app
+from scripts.benchmark_requests import WARMUP_REQUESTS, run_requests
+
+SINGLE_PATH = "/api/v1/example/"
+BATCH_PATH = "/api/v1/example/batch"
+ITEM = {"name": "Bruno Tanabe"}
+
+
+async def main(items: int, batch_size: int, concurrency: int) -> None:
+    single_body = orjson.dumps(ITEM)
+    batch_body = orjson.dumps([ITEM] * batch_size)
+    batches = max(1, items // batch_size)
+
+    with open(os.devnull, "w") as devnull, redirect_stderr(devnull):
+        async with app.router.lifespan_context(app):
+            await run_requests(
+                "POST", SINGLE_PATH, single_body, WARMUP_REQUESTS, concurrency
+            )
+            single = await run_requests(
+                "POST", SINGLE_PATH, single_body, items, concurrency
+            )
+
+            await run_requests(
+                "POST", BATCH_PATH, batch_body, WARMUP_REQUESTS // 10, concurrency
+            )
+            batch = await run_requests(
+                "POST", BATCH_PATH, batch_body, batches, concurrency
+            )
+
+    single_rate = items / single
+    batch_rate = batches * batch_size / batch
+    print(f"single {SINGLE_PATH:<24} {single_rate:>10.0f} items/s")
+    print(f"batch  {BATCH_PATH:<24} {batch_rate:>10.0f} items/s")
+    print(f"speedup {batch_rate / single_rate:>29.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.items, args.batch_size, args.concurrency))
@@ -0,0 +1,80 @@
+"""
+Microbenchmark for app.core.logging.serialize.
+
+Captures real loguru records (with and without extra fields) and measures how many
+records per second are serialized by the previous implementation and the current one.
+
+Usage:
+    python -m scripts.benchmark_logging --records 200000
+"""
+
+import argparse
+import time
+
+import orjson
+from loguru import logger
+
+from app.core.logging import orjson_options, serialize
+
+
+def legacy_serialize(record: dict) -> str:
+    subset = {
+        "timestamp": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "source": f"{record['file'].name}:{record['function']}:{record['line']}",
+    }
+    subset.update(record["extra"])
+    return orjson.dumps(
+        subset, default=str, option=orjson_options & ~orjson.OPT_INDENT_2
+    ).decode()
+
+
+def capture_records() -> list[dict]:
+    records: list[dict] = []
+    logger.remove()
+    logger.add(lambda message: records.append(message.record))  # type: ignore
+
+    logger.info("Starting application...")
+    logger.info("Received request", method="GET", path="/healthz", query="")
+    with logger.contextualize(request_id="Y8aOeN3uFWw"):
+        logger.success(
+            "Request processed successfully",
+            remote_ip="127.0.0.1:50000",
+            status_code=200,
+            elapsed=0.0012,
+        )
+    logger.debug("Returning formatted response")
+
+    logger.remove()
+    return records
+
+
+def benchmark(function, records: list[dict], total: int) -> float:
+    rounds = max(total // len(records), 1)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for record in records:
+            function(record)
+    return rounds * len(records) / (time.perf_counter() - start)
+
+
+def main(total: int) -> None:
+    records = capture_records()
+
+    for record in records:
+        assert serialize(record, pretty=False) == legacy_serialize(record)
+
+    legacy = benchmark(legacy_serialize, records, total)
+    current = benchmark(lambda record: serialize(record, pretty=False), records, total)
+
+    print(f"legacy  {legacy:>12.0f} records/s")
+    print(f"current {current:>12.0f} records/s ({current / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    main(args.records)
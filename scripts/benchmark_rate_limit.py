@@ -0,0 +1,97 @@
+"""
+Overhead of the rate limiter per request.
+
+A limiter check is timed on its own for each algorithm of the memory backend, with hits
+spread over --keys clients. Then POST /api/v1/example/ is run in-process with rate limiting
+enabled and disabled in alternating rounds, and the difference between the best round
+of each is reported per request. Limits are raised so
+that no request is rejected.
+
+Usage:
+    python -m scripts.benchmark_rate_limit --checks 200000 --keys 1000 --requests 5000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+from contextlib import redirect_stderr
+from time import perf_counter
+
+import orjson
+
+from app.app import app
+from app.core.rate_limit import (
+    RATE_LIMIT_ALGORITHMS,
+    MemoryRateLimitBackend,
+    RateLimiter,
+    rate_limiter,
+)
+from app.core.settings import settings
+from scripts.benchmark_requests import WARMUP_REQUESTS, run_requests
+
+PATH = "/api/v1/example/"
+BODY = orjson.dumps({"name": "Bruno Tanabe"})
+UNLIMITED = 10**9
+
+
+async def limiter_check(algorithm: str, checks: int, keys: int) -> float:
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(
+            settings.RATE_LIMIT_SHARDS, settings.RATE_LIMIT_MAX_KEYS
+        ),
+        algorithm=algorithm,
+        limit=UNLIMITED,
+        window=settings.RATE_LIMIT_WINDOW,
+        route_limits={},
+    )
+    clients = [f"client-{index}" for index in range(keys)]
+
+    start = perf_counter()
+    for index in range(checks):
+        await limiter.check(clients[index % keys], None, PATH)
+    return (perf_counter() - start) / checks * 1e6
+
+
+async def request_overhead(
+    requests: int, concurrency: int, rounds: int
+) -> tuple[float, float]:
+    rate_limiter.limit = UNLIMITED
+    elapsed = {False: float("inf"), True: float("inf")}
+
+    with open(os.devnull, "w") as devnull, redirect_stderr(devnull):
+        async with app.router.lifespan_context(app):
+            await run_requests("POST", PATH, BODY, WARMUP_REQUESTS, concurrency)
+            for _ in range(rounds):
+                for enabled in (False, True):
+                    settings.RATE_LIMIT_ENABLED = enabled
+                    elapsed[enabled] = min(
+                        elapsed[enabled],
+                        await run_requests("POST", PATH, BODY, requests, concurrency),
+                    )
+
+    return elapsed[False] / requests * 1e6, elapsed[True] / requests * 1e6
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'limiter check':<32} {'us/check':>10}")
+    for algorithm in RATE_LIMIT_ALGORITHMS:
+        per_check = await limiter_check(algorithm, args.checks, args.keys)
+        print(f"{algorithm:<32} {per_check:>10.2f}")
+
+    disabled, enabled = await request_overhead(
+        args.requests, args.concurrency, args.rounds
+    )
+    print(f"\n{'POST ' + PATH:<32} {'us/request':>10}")
+    print(f"{'rate limit disabled':<32} {disabled:>10.2f}")
+    print(f"{'rate limit enabled':<32} {enabled:>10.2f}")
+    print(f"{'overhead':<32} {enabled - disabled:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
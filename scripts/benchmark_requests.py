@@ -0,0 +1,123 @@
+"""
+In-process throughput benchmark for the application's middleware and routing stack.
+
+Requests are sent straight through the ASGI interface (no sockets, no HTTP client),
+so the numbers reflect the cost of the application itself.
+
+Usage:
+    python -m scripts.benchmark_requests --requests 5000 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from contextlib import redirect_stderr
+
+import orjson
+
+from app.app import app
+from app.core.settings import settings
+
+ROUTES = {
+    "/healthz": ("GET", None),
+    "/api/v1/example/": ("POST", {"name": "Bruno Tanabe"}),
+}
+WARMUP_REQUESTS = 500
+
+
+def build_scope(method: str, path: str, body: bytes) -> dict:
+    headers = [
+        (b"host", b"benchmark"),
+        (b"user-agent", b"benchmark"),
+        (
+            settings.SECURITY_API_KEY_HEADER.lower().encode(),
+            settings.SECURITY_DEFAULT_API_KEY.encode(),
+        ),
+    ]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+
+async def send_request(method: str, path: str, body: bytes) -> int:
+    request_sent = False
+    status = 0
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(build_scope(method, path, body), receive, send)
+    return status
+
+
+async def run_requests(
+    method: str, path: str, body: bytes, requests: int, concurrency: int
+) -> float:
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            status = await send_request(method, path, body)
+            if status != 200:
+                raise RuntimeError(f"Unexpected status {status} for {method} {path}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def benchmark_route(path: str, requests: int, concurrency: int) -> float:
+    method, payload = ROUTES[path]
+    body = orjson.dumps(payload) if payload is not None else b""
+
+    await run_requests(method, path, body, WARMUP_REQUESTS, concurrency)
+    elapsed = await run_requests(method, path, body, requests, concurrency)
+    return requests / elapsed
+
+
+async def main(requests: int, concurrency: int) -> None:
+    results = {}
+    with open(os.devnull, "w") as devnull, redirect_stderr(devnull):
+        async with app.router.lifespan_context(app):
+            for path in ROUTES:
+                results[path] = await benchmark_route(path, requests, concurrency)
+
+    for path, rps in results.items():
+        print(f"{ROUTES[path][0]:<5} {path:<20} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency))
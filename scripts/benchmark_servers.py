@@ -0,0 +1,145 @@
+"""
+Compare the throughput of "python -m app.serve" across server configurations.
+
+Each configuration is started as a separate server with its SERVER_* overrides. It is
+loaded over real sockets by keep-alive HTTP/1.1 clients spread across several processes,
+and the completed requests per second are reported.
+
+Usage:
+    python -m scripts.benchmark_servers --workers 2 --duration 10 --connections 64
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict
+
+CONFIGURATIONS: Dict[str, Dict[str, str]] = {
+    "uvicorn uvloop httptools": {
+        "SERVER_IMPLEMENTATION": "uvicorn",
+        "SERVER_LOOP": "uvloop",
+        "SERVER_HTTP": "httptools",
+    },
+    "uvicorn asyncio h11": {
+        "SERVER_IMPLEMENTATION": "uvicorn",
+        "SERVER_LOOP": "asyncio",
+        "SERVER_HTTP": "h11",
+    },
+    "hypercorn uvloop": {
+        "SERVER_IMPLEMENTATION": "hypercorn",
+        "SERVER_LOOP": "uvloop",
+    },
+    "hypercorn asyncio": {
+        "SERVER_IMPLEMENTATION": "hypercorn",
+        "SERVER_LOOP": "asyncio",
+    },
+}
+STARTUP_TIMEOUT = 30.0
+WARMUP_SECONDS = 1.0
+
+
+async def client(port: int, path: str, deadline: float) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {path} HTTP/1.1\r\nHost: benchmark\r\n\r\n".encode()
+    completed = 0
+    while time.monotonic() < deadline:
+        writer.write(request)
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in headers.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        await reader.readexactly(length)
+        completed += 1
+    writer.close()
+    return completed
+
+
+async def load(port: int, path: str, connections: int, duration: float) -> int:
+    deadline = time.monotonic() + duration
+    results = await asyncio.gather(
+        *(client(port, path, deadline) for _ in range(connections))
+    )
+    return sum(results)
+
+
+def load_process(args: tuple) -> int:
+    return asyncio.run(load(*args))
+
+
+def wait_until_ready(port: int) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"GET /healthz HTTP/1.1\r\nHost: benchmark\r\n\r\n")
+                if sock.recv(16).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server did not become ready on port {port}.")
+
+
+def benchmark(name: str, overrides: Dict[str, str], args: argparse.Namespace) -> float:
+    env = {
+        **os.environ,
+        **overrides,
+        "SERVER_PORT": str(args.port),
+        "SERVER_WORKERS": str(args.workers),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(args.port)
+        connections = max(args.connections // args.load_processes, 1)
+        with multiprocessing.Pool(args.load_processes) as pool:
+            pool.map(
+                load_process,
+                [(args.port, args.path, connections, WARMUP_SECONDS)]
+                * args.load_processes,
+            )
+            completed = sum(
+                pool.map(
+                    load_process,
+                    [(args.port, args.path, connections, args.duration)]
+                    * args.load_processes,
+                )
+            )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    return completed / args.duration
+
+
+def main(args: argparse.Namespace) -> None:
+    results = {
+        name: benchmark(name, overrides, args)
+        for name, overrides in CONFIGURATIONS.items()
+    }
+
+    print(f"{args.workers} workers, {args.connections} connections, GET {args.path}")
+    for name, rps in results.items():
+        print(f"{name:<28} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--load-processes", type=int, default=2)
+    parser.add_argument("--path", default="/healthz")
+    parser.add_argument("--port", type=int, default=8765)
+    main(parser.parse_args())
@@ -0,0 +1,96 @@
+"""
+Microseconds per response saved by API_TRUSTED_OUTPUT on the example routes.
+
+For each route, the response produced by the endpoint is serialized the way FastAPI does
+it with a response_model, validated again and dumped, and the way TrustedAPIRoute does
+it when trusted output is on, dumped only. Building the response models with and without
+validation is measured as well.
+
+Usage:
+    python -m scripts.benchmark_trusted_output --iterations 20000
+"""
+
+import argparse
+import timeit
+
+from pydantic import TypeAdapter
+
+from app.modules.example.presentation.schemas import (
+    ExampleBatchItemResponse,
+    ExampleBatchResponse,
+    ExampleResponse,
+)
+
+BATCH_SIZE = 20
+
+
+def build_response(validated: bool) -> ExampleResponse:
+    if validated:
+        return ExampleResponse(message="Hello Bruno Tanabe!")
+    return ExampleResponse.model_construct(message="hello bruno tanabe!")
+
+
+def build_batch_response(validated: bool) -> ExampleBatchResponse:
+    model = (
+        ExampleBatchItemResponse
+        if validated
+        else ExampleBatchItemResponse.model_construct
+    )
+    items = [
+        model(index=index, code=200, result=build_response(validated))
+        for index in range(BATCH_SIZE)
+    ]
+    if validated:
+        return ExampleBatchResponse(items=items, succeeded=BATCH_SIZE, failed=0)
+    return ExampleBatchResponse.model_construct(
+        items=items, succeeded=BATCH_SIZE, failed=0
+    )
+
+
+def per_call(fn, iterations: int) -> float:
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main(iterations: int) -> None:
+    builders = {
+        "/api/v1/example/": build_response,
+        "/api/v1/example/batch": build_batch_response,
+    }
+
+    print(f"{'step':<40} {'validated':>11} {'trusted':>11} {'saved':>11}")
+    for path, builder in builders.items():
+        content = builder(True)
+        adapter = TypeAdapter(type(content))
+
+        def serialize_validated():
+            value = adapter.validate_python(content, from_attributes=True)
+            return adapter.dump_python(value, mode="json", by_alias=True)
+
+        def serialize_trusted():
+            return content.model_dump(mode="json", by_alias=True)
+
+        assert serialize_validated() == serialize_trusted()
+
+        rows = {
+            f"{path} serialize": (
+                per_call(serialize_validated, iterations),
+                per_call(serialize_trusted, iterations),
+            ),
+            f"{path} build model": (
+                per_call(lambda: builder(True), iterations),
+                per_call(lambda: builder(False), iterations),
+            ),
+        }
+        for step, (validated, trusted) in rows.items():
+            print(
+                f"{step:<40} {validated:>9.2f}us {trusted:>9.2f}us "
+                f"{validated - trusted:>9.2f}us"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    main(args.iterations)
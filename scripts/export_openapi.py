@@ -0,0 +1,30 @@
+"""
+Export the application's OpenAPI document so it does not have to be generated at startup.
+
+Point OPENAPI_PREBUILT_PATH at the written file to serve it instead of building the
+schema from the routes.
+
+Usage:
+    python -m scripts.export_openapi --output openapi.json
+"""
+
+import argparse
+from pathlib import Path
+
+from app.app import app
+from app.core.openapi import build_openapi_document
+
+
+def main(output: Path) -> None:
+    document = build_openapi_document(app)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(document.body)
+    print(f"Wrote {len(document.body)} bytes to {output} (etag {document.etag})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, default=Path("openapi.json"))
+    args = parser.parse_args()
+
+    main(args.output)
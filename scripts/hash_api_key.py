@@ -0,0 +1,68 @@
+"""
+Create an API key entry for the file read by the API key store.
+
+A new random key is generated unless --key is given. The raw key is printed once, and the
+entry with its hash is printed or, with --file, added to the key file. The file is replaced
+atomically, so running workers pick it up on their next reload without reading a partial
+file. Hashes use SECURITY_API_KEYS_HMAC_SECRET when it is set.
+
+Usage:
+    python -m scripts.hash_api_key --name "Billing service" --scopes example:read --quota 1000
+    python -m scripts.hash_api_key --name "Reports" --file keys.json
+"""
+
+import argparse
+import os
+import secrets
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from app.core.api_keys import hash_api_key
+
+
+def entry(
+    raw_key: str, name: str, scopes: List[str], quota: Optional[int]
+) -> Dict[str, Any]:
+    return {
+        "hash": hash_api_key(raw_key),
+        "name": name,
+        "scopes": scopes,
+        "quota": quota,
+    }
+
+
+def add_to_file(path: Path, new_entry: Dict[str, Any]) -> None:
+    entries = orjson.loads(path.read_bytes()) if path.is_file() else []
+    entries = [item for item in entries if item["name"] != new_entry["name"]]
+    entries.append(new_entry)
+
+    fd, temporary = tempfile.mkstemp(dir=path.parent or ".", prefix=f".{path.name}.")
+    with os.fdopen(fd, "wb") as file:
+        file.write(orjson.dumps(entries, option=orjson.OPT_INDENT_2))
+    os.replace(temporary, path)
+
+
+def main(args: argparse.Namespace) -> None:
+    raw_key = args.key or secrets.token_urlsafe(32)
+    new_entry = entry(raw_key, args.name, args.scopes, args.quota)
+
+    if args.file:
+        add_to_file(Path(args.file), new_entry)
+        print(f"Added {args.name} to {args.file}")
+    else:
+        print(orjson.dumps(new_entry).decode())
+    if not args.key:
+        print(f"API key: {raw_key}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--key", default=None)
+    parser.add_argument("--scopes", nargs="*", default=[])
+    parser.add_argument("--quota", type=int, default=None)
+    parser.add_argument("--file", default=None)
+    main(parser.parse_args())
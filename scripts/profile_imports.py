@@ -0,0 +1,109 @@
+"""
+Profile the cold import of a module and rank the cost of every module it imports.
+
+The target is imported in a fresh interpreter with -X importtime. The output is parsed and
+the slowest modules are printed by self time, along with the total per top-level package.
+With --budget, the command exits with status 1 when the cold import takes longer than the
+budget, so it can gate CI. The default budget is STARTUP_IMPORT_BUDGET.
+
+Usage:
+    python -m scripts.profile_imports --top 25
+    python -m scripts.profile_imports --module app.app --budget 1.0 --repeat 3
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile(module: str) -> List[ImportRecord]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(
+                ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return records
+
+
+def cold_import_time(records: List[ImportRecord], module: str) -> float:
+    for record in records:
+        if record.module == module and record.depth == 0:
+            return record.cumulative_us / 1e6
+    raise SystemExit(f"{module} not found in the -X importtime output.")
+
+
+def report(records: List[ImportRecord], top: int) -> None:
+    packages: Dict[str, int] = defaultdict(int)
+    for record in records:
+        packages[record.module.split(".")[0]] += record.self_us
+
+    print(f"{'self (ms)':>10} {'cumulative (ms)':>16}  module")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(
+            f"{record.self_us / 1000:>10.1f} {record.cumulative_us / 1000:>16.1f}"
+            f"  {record.module}"
+        )
+
+    print(f"\n{'self (ms)':>10}  package")
+    for package, total in sorted(packages.items(), key=lambda p: p[1], reverse=True)[
+        :top
+    ]:
+        print(f"{total / 1000:>10.1f}  {package}")
+
+
+def main(module: str, top: int, repeat: int, budget: Optional[float]) -> None:
+    runs = [profile(module) for _ in range(repeat)]
+    best = min(runs, key=lambda records: cold_import_time(records, module))
+    elapsed = cold_import_time(best, module)
+
+    report(best, top)
+    print(f"\nCold import of {module}: {elapsed:.3f}s (best of {repeat})")
+
+    if budget is not None:
+        if elapsed > budget:
+            print(f"Over the startup budget of {budget:.3f}s.")
+            raise SystemExit(1)
+        print(f"Within the startup budget of {budget:.3f}s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.app")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=None)
+    parser.add_argument("--no-budget", action="store_true")
+    args = parser.parse_args()
+
+    budget = args.budget
+    if budget is None and not args.no_budget:
+        from app.core.settings import settings
+
+        budget = settings.STARTUP_IMPORT_BUDGET
+
+    main(args.module, args.top, args.repeat, budget)
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.core.database import SQLiteDriver
+
+
+def test_sqlite_driver_binds_reordered_and_repeated_positional_parameters(tmp_path):
+    async def run():
+        driver = SQLiteDriver(str(tmp_path / "test.db"), statement_cache_size=16)
+        connection = await driver.connect()
+        try:
+            await driver.execute(connection, "CREATE TABLE pairs (a TEXT, b TEXT)", ())
+            await driver.execute_many(
+                connection,
+                "INSERT INTO pairs (a, b) VALUES ($1, $2)",
+                [("x", "y"), ("z", "z")],
+            )
+            reordered = await driver.fetch_all(
+                connection, "SELECT a, b FROM pairs WHERE b = $2 AND a = $1", ("x", "y")
+            )
+            repeated = await driver.fetch_all(
+                connection, "SELECT a, b FROM pairs WHERE a = $1 AND b = $1", ("z",)
+            )
+        finally:
+            await driver.close(connection)
+        return reordered, repeated
+
+    reordered, repeated = asyncio.run(run())
+
+    assert reordered == [{"a": "x", "b": "y"}]
+    assert repeated == [{"a": "z", "b": "z"}]
@@ -0,0 +1,15 @@
+from app.core.settings import settings
+from scripts.profile_imports import cold_import_time, profile
+
+MODULE = "app.app"
+REPEAT = 3
+
+
+def test_cold_import_of_app_is_within_budget():
+    elapsed = min(cold_import_time(profile(MODULE), MODULE) for _ in range(REPEAT))
+
+    assert elapsed <= settings.STARTUP_IMPORT_BUDGET, (
+        f"Cold import of {MODULE} took {elapsed:.3f}s, over the budget of "
+        f"{settings.STARTUP_IMPORT_BUDGET:.3f}s. Run 'python -m scripts.profile_imports' "
+        "to see which modules are slow."
+    )